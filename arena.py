@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import List
+
+import numpy as np
+from numpy import ndarray
+
+from tetris_solver import ENGINE_ERRORS, TetrisSolver, TopOutError
+
+# Values of the results array for the boards which do not have a height
+RESULT_PENDING = -1
+RESULT_OVERFLOW = -2
+RESULT_ENGINE_ERROR = -3
+
+
+@dataclass(frozen=True)
+class ArenaSpec:
+    """
+    Everything a worker process needs to attach to an existing `BoardArena`.
+    """
+
+    grids_name: str
+    results_name: str
+    count: int
+    rows: int
+    columns: int
+
+
+class BoardArena:
+    """
+    Preallocated shared memory for the grids and results of a batch of solves, so worker processes
+    write their outputs in place and the parent reads them without copying or unpickling.
+
+    - `grids` - A `(count, rows, columns)` uint8 array. Every solver uses one of its grids as a view
+    - `results` - A `(count,)` int64 array with the height of every board, `RESULT_PENDING` until the
+    board is solved, `RESULT_OVERFLOW` if the sequence topped out the grid (see `TopOutError`) or
+    `RESULT_ENGINE_ERROR` if the engine could not compute a placement
+
+    The arena which creates the shared memory owns it and unlinks it on `close`, also when a worker
+    crashes. Use it as a context manager:
+    ```
+    with BoardArena(len(sequences)) as arena:
+        arena.solve(sequences, processes=4)
+        heights = arena.results.copy()
+    ```
+    """
+
+    def __init__(self, count: int, rows: int = 10, columns: int = 10):
+        self.owner = True
+        grids_memory = SharedMemory(create=True, size=max(count * rows * columns, 1))
+        try:
+            results_memory = SharedMemory(
+                create=True, size=max(count * np.dtype(np.int64).itemsize, 1)
+            )
+        except BaseException:
+            grids_memory.close()
+            grids_memory.unlink()
+            raise
+        self.__init_views(grids_memory, results_memory, count, rows, columns)
+        self.grids.fill(0)
+        self.results.fill(RESULT_PENDING)
+
+    @classmethod
+    def attach(cls, spec: ArenaSpec) -> "BoardArena":
+        """
+        Attaches to the shared memory of an arena created by another process.
+        The attached arena does not own the shared memory, so `close` does not unlink it.
+        """
+        arena = cls.__new__(cls)
+        arena.owner = False
+        arena.__init_views(
+            SharedMemory(name=spec.grids_name),
+            SharedMemory(name=spec.results_name),
+            spec.count,
+            spec.rows,
+            spec.columns,
+        )
+        return arena
+
+    def __init_views(
+        self,
+        grids_memory: SharedMemory,
+        results_memory: SharedMemory,
+        count: int,
+        rows: int,
+        columns: int,
+    ):
+        self.grids_memory = grids_memory
+        self.results_memory = results_memory
+        self.spec = ArenaSpec(
+            grids_memory.name, results_memory.name, count, rows, columns
+        )
+        self.grids: ndarray[np.uint8] = np.ndarray(
+            (count, rows, columns), dtype=np.uint8, buffer=grids_memory.buf
+        )
+        self.results: ndarray[np.int64] = np.ndarray(
+            (count,), dtype=np.int64, buffer=results_memory.buf
+        )
+
+    def __enter__(self) -> "BoardArena":
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
+
+    def close(self):
+        """
+        Releases the views and the shared memory. The owner also unlinks the shared memory.
+        """
+        self.grids = None
+        self.results = None
+        for shared_memory in (self.grids_memory, self.results_memory):
+            try:
+                shared_memory.close()
+            except BufferError:
+                # views of the caller are still alive, the memory is unmapped once they are released
+                pass
+            if self.owner:
+                shared_memory.unlink()
+        self.owner = False
+
+    def solve_range(self, start: int, sequences: List[str]):
+        """
+        Solves the sequences into the boards `start` to `start + len(sequences)`, in place.
+        """
+        rows, columns = self.spec.rows, self.spec.columns
+        for board_index, sequence in enumerate(sequences, start):
+            tetris_solver = TetrisSolver(
+                rows, columns, grid=self.grids[board_index], detect_top_out=True
+            )
+            try:
+                self.results[board_index] = tetris_solver.solve(sequence)
+            except TopOutError:
+                self.results[board_index] = RESULT_OVERFLOW
+            except ENGINE_ERRORS:
+                self.results[board_index] = RESULT_ENGINE_ERROR
+
+    def solve(self, sequences: List[str], processes: int = 1):
+        """
+        Solves every sequence into its board, fanning contiguous chunks of boards out to
+        `processes` worker processes which attach to the arena.
+
+        Args
+        ----
+        - `sequences:List[str]` - One input sequence per board, for example 'Q0,Q1'
+        - `processes:int` - The total of worker processes
+        """
+        if len(sequences) != self.spec.count:
+            raise ValueError(
+                f"Expected {self.spec.count} sequences but got {len(sequences)}"
+            )
+
+        if processes <= 1:
+            self.solve_range(0, sequences)
+            return
+
+        chunk_size = -(-len(sequences) // processes)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(
+                    _solve_arena_chunk,
+                    self.spec,
+                    start,
+                    sequences[start : start + chunk_size],
+                )
+                for start in range(0, len(sequences), chunk_size)
+            ]
+            for future in futures:
+                future.result()
+
+
+def _solve_arena_chunk(spec: ArenaSpec, start: int, sequences: List[str]):
+    """
+    Worker entry point: attaches to the arena and solves a chunk of its boards.
+    """
+    arena = BoardArena.attach(spec)
+    try:
+        arena.solve_range(start, sequences)
+    finally:
+        arena.close()
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+import time
+from typing import Iterable, Iterator
+
+# Reasons why a budget was exhausted
+EXHAUSTED_MOVES = "moves"
+EXHAUSTED_TIME = "time"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class SolveProgress:
+    """
+    How far a solve got before its budget was exhausted.
+
+    - `moves:int` - The total of moves placed
+    - `height:int` - The height of the grid after those moves
+    - `reason:str` - `EXHAUSTED_MOVES`, `EXHAUSTED_TIME` or `CANCELLED`
+    """
+
+    moves: int
+    height: int
+    reason: str
+
+
+class SolveTimeout(Exception):
+    """
+    Raised when a solve stops because its `SolveBudget` was exhausted or cancelled.
+    The partial result is in `progress`, and the solver keeps the grid of the placed moves.
+    """
+
+    def __init__(self, progress: SolveProgress):
+        self.progress = progress
+        super().__init__(
+            f"Solve stopped after {progress.moves} moves at height {progress.height} "
+            f"({progress.reason})"
+        )
+
+
+class SolveBudget:
+    """
+    Limits a solve to a total of moves and/or seconds. The solver checks the budget cooperatively
+    between placements and raises `SolveTimeout` once it is exhausted, or once `cancel` is called
+    from another thread.
+
+    Solves without a budget do not check anything, so they run at full speed.
+
+    Usage
+    -----
+    ```
+    try:
+        height = TetrisSolver().solve(sequence, budget=SolveBudget(max_seconds=0.5))
+    except SolveTimeout as timeout:
+        partial_height = timeout.progress.height
+    ```
+
+    Args
+    ----
+    - `max_moves:int` - The maximum total of moves placed
+    - `max_seconds:float` - The maximum seconds spent placing moves, measured from the start of the solve
+    - `check_every:int` - The total of moves between clock reads
+    """
+
+    def __init__(
+        self,
+        max_moves: int | None = None,
+        max_seconds: float | None = None,
+        check_every: int = 64,
+    ):
+        self.max_moves = max_moves
+        self.max_seconds = max_seconds
+        self.check_every = check_every
+        # total of moves placed by the current solve
+        self.moves = 0
+        self.exhausted_reason: str | None = None
+        self.cancelled = False
+        # monotonic time the current solve must stop at
+        self.deadline: float | None = None
+
+    def cancel(self):
+        """
+        Stops the solve using this budget before its next placement. Safe to call from any thread.
+        """
+        self.cancelled = True
+
+    def start(self):
+        """
+        Starts the budget of a new solve: clears the counted moves and starts the clock.
+        """
+        self.moves = 0
+        self.exhausted_reason = None
+        self.deadline = None
+        if self.max_seconds is not None:
+            self.deadline = time.monotonic() + self.max_seconds
+
+    def allows(self, moves: int) -> bool:
+        """
+        Records that `moves` moves were placed, or skipped, since `start`, and checks whether the
+        budget allows placing the next one. Otherwise sets `exhausted_reason`.
+        """
+        self.moves = moves
+        if self.cancelled:
+            self.exhausted_reason = CANCELLED
+            return False
+        if self.max_moves is not None and moves >= self.max_moves:
+            self.exhausted_reason = EXHAUSTED_MOVES
+            return False
+        if (
+            self.deadline is not None
+            and moves % self.check_every == 0
+            and time.monotonic() >= self.deadline
+        ):
+            self.exhausted_reason = EXHAUSTED_TIME
+            return False
+        return True
+
+    def track(self, moves: Iterable[tuple[str, int]]) -> Iterator[tuple[str, int]]:
+        """
+        Yields the moves while the budget lasts, counting them in `moves`. When the budget runs out
+        it stops early and sets `exhausted_reason`.
+        """
+        self.start()
+        for move in moves:
+            if not self.allows(self.moves):
+                return
+            yield move
+            self.moves += 1
@@ -0,0 +1,96 @@
+from typing import List
+
+from sequences import parse_sequence, sequence_key
+from symmetry import canonicalize, mirror_moves, verify_symmetry
+from tetris_solver import TetrisSolver
+
+
+class SolveCache:
+    """
+    In-memory cache of sequence heights, keyed by the normalized sequence and the grid dimensions.
+
+    Args
+    ----
+    - `rows:int`, `columns:int` - The grid dimensions
+    - `symmetric:bool` - If `True`, every miss also solves the sequence mirrored under horizontal
+    reflection. When both heights match, the sequence and its mirror share one entry under their
+    canonical form. Otherwise each orientation gets its own entry.
+    - `verify:bool` - If `True`, every miss also solves the mirrored sequence and raises a
+    `SymmetryError` if it has a different height.
+
+    NOTE: The engine is frequently not mirror symmetric. For example `I0,S3` solves to 3 but its mirror
+    `I6,Z4` solves to 2, and `Z1` raises an engine error while its mirror `S6` does not. Most random
+    sequences fail `verify`, so `symmetric` only saves work for workloads with symmetric sequences.
+    """
+
+    def __init__(
+        self,
+        rows: int = 10,
+        columns: int = 10,
+        symmetric: bool = False,
+        verify: bool = False,
+    ):
+        self.rows = rows
+        self.columns = columns
+        self.symmetric = symmetric
+        self.verify = verify
+        self.tetris_solver = TetrisSolver(rows, columns)
+        self.heights: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __solve_moves(self, moves: List[tuple[str, int]]) -> int:
+        try:
+            return int(self.tetris_solver.solve_moves(moves))
+        finally:
+            self.tetris_solver.reset()
+
+    def __shared_key(self, moves: List[tuple[str, int]]) -> str:
+        """
+        The key a sequence and its mirror share when both have the same height
+        """
+        canonical_moves, _ = canonicalize(moves, self.columns)
+        return "mirror:" + sequence_key(canonical_moves, self.rows, self.columns)
+
+    def solve(self, input: str) -> int:
+        """
+        Gets the height of the input sequence from the cache, solving it on a miss.
+
+        Args
+        ----
+        `input:str` - The input containing the sequence of polyominoes to process. For example 'Q0,Q1'
+        """
+        moves: List[tuple[str, int]] = parse_sequence(input)
+        key: str = sequence_key(moves, self.rows, self.columns)
+        height: int | None = self.heights.get(key)
+        if height is None and self.symmetric:
+            height = self.heights.get(self.__shared_key(moves))
+        if height is not None:
+            self.hits += 1
+            return height
+
+        self.misses += 1
+        if self.verify:
+            height = int(verify_symmetry(moves, self.rows, self.columns))
+        else:
+            height = self.__solve_moves(moves)
+        if not self.symmetric:
+            self.heights[key] = height
+            return height
+
+        mirrored_moves = mirror_moves(moves, self.columns)
+        try:
+            mirrored_height = (
+                height if self.verify else self.__solve_moves(mirrored_moves)
+            )
+        except Exception:
+            mirrored_height = None
+
+        if mirrored_height == height:
+            self.heights[self.__shared_key(moves)] = height
+        else:
+            self.heights[key] = height
+            if mirrored_height is not None:
+                mirrored_key = sequence_key(mirrored_moves, self.rows, self.columns)
+                self.heights[mirrored_key] = mirrored_height
+        return height
@@ -1,3 +1,8 @@
+from typing import List
+
+import numpy as np
+from numpy import ndarray
+
 from models import (
     QPolyminoe,
     JPolyminoe,
@@ -10,21 +15,62 @@ from models import (
 )
 
 
+# Classes of all the polyominoes the factory can create, keyed by letter. Their order defines the piece
+# ids used by the simulation and stored in keyframes, so new polyominoes must be added at the end.
+POLYOMINOE_CLASSES: dict[str, type[AbstractPolyominoe]] = {
+    "Q": QPolyminoe,
+    "I": IPolyminoe,
+    "Z": ZPolyminoe,
+    "T": TPolyminoe,
+    "S": SPolyminoe,
+    "L": LPolyminoe,
+    "J": JPolyminoe,
+}
+
+# Letters of the polyominoes, indexed by piece id
+PIECES: List[str] = list(POLYOMINOE_CLASSES)
+
+# Piece id of every polyominoe class
+PIECE_IDS: dict[type, int] = {
+    polyomino_class: piece_id
+    for piece_id, polyomino_class in enumerate(POLYOMINOE_CLASSES.values())
+}
+
+# Total of columns each polyominoe occupies, keyed by letter
+POLYOMINOE_WIDTHS: dict[str, int] = {
+    polyominoe: polyomino_class.width()
+    for polyominoe, polyomino_class in POLYOMINOE_CLASSES.items()
+}
+
+# Total of columns each polyominoe occupies, indexed by piece id
+PIECE_WIDTHS: ndarray[int] = np.array([POLYOMINOE_WIDTHS[piece] for piece in PIECES])
+
+
 class PolyominoeFactory:
     def __init__(self):
-        self.polyominoe_classes = {
-            "Q": QPolyminoe,
-            "I": IPolyminoe,
-            "Z": ZPolyminoe,
-            "T": TPolyminoe,
-            "S": SPolyminoe,
-            "L": LPolyminoe,
-            "J": JPolyminoe,
+        self.polyominoe_classes = POLYOMINOE_CLASSES
+        # released polyominoes, per class, which are handed out again by `create`
+        self.pool: dict[type, List[AbstractPolyominoe]] = {
+            polyomino_class: [] for polyomino_class in self.polyominoe_classes.values()
         }
 
     def create(self, polyomino_type: str) -> AbstractPolyominoe:
         polyomino_class = self.polyominoe_classes.get(polyomino_type)
         if polyomino_class:
+            pool: List[AbstractPolyominoe] = self.pool[polyomino_class]
+            if pool:
+                return pool.pop()
             return polyomino_class()
         else:
             raise Exception(f"{polyomino_type} is not implemented in the factory yet!")
+
+    def release(self, polyominoe: AbstractPolyominoe):
+        """
+        Returns a polyominoe which is no longer on the grid to the pool, so it can be reused by `create`
+
+        Args
+        ----
+        - `polyominoe:AbstractPolyominoe` - The polyominoe to release
+        """
+        polyominoe.reset()
+        self.pool[type(polyominoe)].append(polyominoe)
@@ -0,0 +1,438 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import argparse
+import os
+import time
+from typing import Callable, List
+
+import numpy as np
+from numpy import ndarray
+
+from budget import SolveBudget
+from factory import PIECE_WIDTHS, PIECES
+from reference.tetris_solver import TetrisSolver as ReferenceSolver
+from sequences import format_moves
+from tetris_solver import TetrisSolver
+
+# The height and final grid of a solve, or the name of the raised error and `None`
+Outcome = tuple[int | str, bytes | None]
+
+# Solves the moves on a `rows` x `columns` grid
+Backend = Callable[[List[tuple[str, int]], int, int], Outcome]
+
+
+def _error_name(error: Exception) -> str:
+    """
+    The name of the built-in class of an error, so the dedicated errors of the optimized engine, such
+    as `WrappedPolyominoeError`, match the built-in errors the reference raises in the same cases.
+    """
+    return next(
+        error_class.__name__
+        for error_class in type(error).__mro__
+        if error_class.__module__ == "builtins"
+    )
+
+
+def _solver_outcome(
+    tetris_solver: TetrisSolver,
+    moves: List[tuple[str, int]],
+    budget: SolveBudget | None = None,
+) -> Outcome:
+    try:
+        height = tetris_solver.solve_moves(moves, budget)
+    except Exception as error:
+        return _error_name(error), None
+    else:
+        return int(height), tetris_solver.grid.astype(np.uint8).tobytes()
+    finally:
+        tetris_solver.reset()
+
+
+# Solvers of every backend, keyed by the backend and the grid dimensions. They are reset after every
+# sequence, and every worker process has its own.
+_solvers: dict[tuple[str, int, int], TetrisSolver | ReferenceSolver] = {}
+
+
+def _solver(
+    backend: str, rows: int, columns: int, create: Callable
+) -> TetrisSolver | ReferenceSolver:
+    tetris_solver = _solvers.get((backend, rows, columns))
+    if tetris_solver is None:
+        tetris_solver = _solvers[(backend, rows, columns)] = create()
+    return tetris_solver
+
+
+def reference_backend(
+    moves: List[tuple[str, int]], rows: int, columns: int
+) -> Outcome:
+    """
+    Solves with the frozen engine of the `reference` package, which places every move one by one
+    without any of the optimizations.
+    """
+    tetris_solver: ReferenceSolver = _solver(
+        "reference", rows, columns, lambda: ReferenceSolver(rows, columns)
+    )
+    try:
+        height = tetris_solver.solve(format_moves(moves))
+    except Exception as error:
+        return _error_name(error), None
+    else:
+        return int(height), tetris_solver.grid.astype(np.uint8).tobytes()
+    finally:
+        tetris_solver.reset()
+
+
+def fast_forward_backend(
+    moves: List[tuple[str, int]], rows: int, columns: int
+) -> Outcome:
+    """
+    Skips the repetitions of periodic sequences once the solver state recurs.
+    """
+    return _solver_outcome(
+        _solver("fast_forward", rows, columns, lambda: TetrisSolver(rows, columns)),
+        moves,
+    )
+
+
+def unoptimized_backend(
+    moves: List[tuple[str, int]], rows: int, columns: int
+) -> Outcome:
+    """
+    Places every move one by one, without fast-forwarding.
+    """
+    return _solver_outcome(
+        _solver(
+            "unoptimized",
+            rows,
+            columns,
+            lambda: TetrisSolver(rows, columns, fast_forward=False),
+        ),
+        iter(moves),
+    )
+
+
+def uint8_grid_backend(
+    moves: List[tuple[str, int]], rows: int, columns: int
+) -> Outcome:
+    """
+    Solves on an external uint8 grid, the way the boards of a `BoardArena` are solved.
+    """
+    return _solver_outcome(
+        _solver(
+            "uint8_grid",
+            rows,
+            columns,
+            lambda: TetrisSolver(
+                rows, columns, grid=np.zeros((rows, columns), dtype=np.uint8)
+            ),
+        ),
+        moves,
+    )
+
+
+def budgeted_backend(
+    moves: List[tuple[str, int]], rows: int, columns: int
+) -> Outcome:
+    """
+    Solves with an unlimited budget, which is checked between every placement.
+    """
+    return _solver_outcome(
+        _solver("budgeted", rows, columns, lambda: TetrisSolver(rows, columns)),
+        moves,
+        SolveBudget(),
+    )
+
+
+# Backends which must reproduce the outcomes of the `reference_backend` exactly
+BACKENDS: dict[str, Backend] = {
+    "fast_forward": fast_forward_backend,
+    "unoptimized": unoptimized_backend,
+    "uint8_grid": uint8_grid_backend,
+    "budgeted": budgeted_backend,
+}
+
+
+@dataclass
+class Mismatch:
+    """
+    A sequence for which at least one backend disagrees with the reference.
+
+    - `sequence:str` - The generated sequence, for example 'Q0,Q1'
+    - `minimized:str` - The shortest sequence found which still reproduces the mismatch
+    - `outcomes:dict[str, Outcome]` - The outcome of the reference and of every backend for the minimized sequence
+    """
+
+    sequence: str
+    minimized: str
+    outcomes: dict[str, Outcome]
+
+
+@dataclass
+class FuzzReport:
+    """
+    - `sequences:int` - The total of sequences which were run through every backend
+    - `mismatched_sequences:int` - The total of sequences for which a backend disagreed with the reference
+    - `mismatches:List[Mismatch]` - The minimized mismatches, at most `max_mismatches` per chunk
+    - `seconds:float` - The wall clock time of the run
+    """
+
+    sequences: int = 0
+    mismatched_sequences: int = 0
+    mismatches: List[Mismatch] = field(default_factory=list)
+    seconds: float = 0
+
+    @property
+    def sequences_per_second(self) -> float:
+        return self.sequences / self.seconds if self.seconds else 0.0
+
+    def merge(self, other: "FuzzReport") -> "FuzzReport":
+        return FuzzReport(
+            self.sequences + other.sequences,
+            self.mismatched_sequences + other.mismatched_sequences,
+            self.mismatches + other.mismatches,
+            self.seconds,
+        )
+
+
+def generate_sequences(
+    rng: np.random.Generator,
+    total: int,
+    max_length: int,
+    columns: int,
+    periodic_probability: float = 0.25,
+) -> List[List[tuple[str, int]]]:
+    """
+    Generates random sequences with a length between 1 and `max_length`, where every polyominoe
+    fits in the grid. A share of them repeat a random pattern before a short tail, to exercise the
+    fast-forward path.
+
+    Returns
+    -------
+    A list with the `(polyominoe, column_index)` moves of every sequence
+    """
+    pieces = rng.integers(0, len(PIECES), size=(total, max_length))
+    placements = rng.integers(0, columns - PIECE_WIDTHS[pieces] + 1)
+    lengths = rng.integers(1, max_length + 1, size=total)
+
+    # periodic sequences repeat their first `period` moves, followed by a tail of up to 2 random moves
+    is_periodic = rng.random(total) < periodic_probability
+    periods = np.where(
+        is_periodic, rng.integers(1, max_length + 1, size=total), max_length
+    )
+    tail_starts = lengths - np.where(is_periodic, rng.integers(0, 3, size=total), 0)
+    move_indices = np.where(
+        np.arange(max_length) < tail_starts[:, np.newaxis],
+        np.arange(max_length) % periods[:, np.newaxis],
+        np.arange(max_length),
+    )
+    pieces = np.take_along_axis(pieces, move_indices, axis=1)
+    placements = np.take_along_axis(placements, move_indices, axis=1)
+
+    letters: ndarray[str] = np.array(PIECES)[pieces]
+    return [
+        list(zip(sequence_letters[:length], sequence_columns[:length]))
+        for sequence_letters, sequence_columns, length in zip(
+            letters.tolist(), placements.tolist(), lengths.tolist()
+        )
+    ]
+
+
+def _run_backends(
+    moves: List[tuple[str, int]],
+    backends: dict[str, Backend],
+    rows: int,
+    columns: int,
+) -> dict[str, Outcome]:
+    outcomes = {"reference": reference_backend(moves, rows, columns)}
+    for name, backend in backends.items():
+        outcomes[name] = backend(moves, rows, columns)
+    return outcomes
+
+
+def _is_mismatch(outcomes: dict[str, Outcome]) -> bool:
+    reference_outcome = outcomes["reference"]
+    return any(outcome != reference_outcome for outcome in outcomes.values())
+
+
+def minimize(
+    moves: List[tuple[str, int]],
+    is_mismatch: Callable[[List[tuple[str, int]]], bool],
+) -> List[tuple[str, int]]:
+    """
+    Shrinks a mismatching sequence by removing chunks of moves while the mismatch reproduces,
+    halving the chunk size down to single moves (delta debugging). The result is 1-minimal:
+    removing any single move makes the mismatch disappear.
+
+    Args
+    ----
+    - `moves:List[tuple[str, int]]` - A sequence for which `is_mismatch` is `True`
+    - `is_mismatch:Callable` - Runs a candidate sequence through the backends
+    """
+    chunk_size = max(len(moves) // 2, 1)
+    while True:
+        removed = False
+        start = 0
+        while start < len(moves):
+            candidate = moves[:start] + moves[start + chunk_size :]
+            if candidate and is_mismatch(candidate):
+                moves = candidate
+                removed = True
+            else:
+                start += chunk_size
+        if chunk_size > 1:
+            chunk_size //= 2
+        elif not removed:
+            return moves
+
+
+def _fuzz_chunk(
+    seed: np.random.SeedSequence,
+    total: int,
+    max_length: int,
+    backends: dict[str, Backend],
+    rows: int,
+    columns: int,
+    max_mismatches: int,
+) -> FuzzReport:
+    """
+    Runs a chunk of generated sequences through the reference and every backend.
+    """
+    rng = np.random.default_rng(seed)
+    report = FuzzReport(sequences=total)
+    for moves in generate_sequences(rng, total, max_length, columns):
+        if not _is_mismatch(_run_backends(moves, backends, rows, columns)):
+            continue
+
+        report.mismatched_sequences += 1
+        if len(report.mismatches) < max_mismatches:
+            minimized = minimize(
+                moves,
+                lambda candidate: _is_mismatch(
+                    _run_backends(candidate, backends, rows, columns)
+                ),
+            )
+            report.mismatches.append(
+                Mismatch(
+                    format_moves(moves),
+                    format_moves(minimized),
+                    _run_backends(minimized, backends, rows, columns),
+                )
+            )
+    return report
+
+
+def fuzz(
+    sequences: int,
+    backends: dict[str, Backend] | None = None,
+    max_length: int = 30,
+    rows: int = 10,
+    columns: int = 10,
+    seed: int | None = None,
+    processes: int = 1,
+    chunk_size: int = 10_000,
+    max_mismatches: int = 10,
+) -> FuzzReport:
+    """
+    Differential fuzzing: runs seeded random sequences through the `reference_backend` and every
+    alternative backend, comparing the heights, final grids and raised errors. Every mismatch is
+    minimized to the shortest sequence which still reproduces it.
+
+    Sequences are generated in chunks of `chunk_size`, each with its own random stream derived from
+    `seed`, so the mismatches for a given seed are the same regardless of the total of `processes`.
+
+    Args
+    ----
+    - `sequences:int` - The total of sequences to generate
+    - `backends:dict[str, Backend]` - The backends to compare with the reference, `BACKENDS` by default.
+    They must be picklable when `processes > 1`
+    - `max_length:int` - The maximum total of moves of a sequence
+    - `rows:int`, `columns:int` - The grid dimensions
+    - `seed:int` - The seed of the random generator
+    - `processes:int` - The total of worker processes the chunks are fanned out to
+    - `max_mismatches:int` - The maximum total of mismatches minimized per chunk. The rest are only counted
+
+    Returns
+    -------
+    A `FuzzReport` with the minimized mismatches and the throughput of the run
+    """
+    if backends is None:
+        backends = BACKENDS
+
+    started = time.perf_counter()
+    chunk_totals: List[int] = [
+        min(chunk_size, sequences - start) for start in range(0, sequences, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_totals))
+    arguments = [
+        (chunk_seed, total, max_length, backends, rows, columns, max_mismatches)
+        for chunk_seed, total in zip(seeds, chunk_totals)
+    ]
+
+    report = FuzzReport()
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(_fuzz_chunk, *chunk_arguments)
+                for chunk_arguments in arguments
+            ]
+            for future in futures:
+                report = report.merge(future.result())
+    else:
+        for chunk_arguments in arguments:
+            report = report.merge(_fuzz_chunk(*chunk_arguments))
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of the engine backends against the reference"
+    )
+    parser.add_argument(
+        "--sequences",
+        type=int,
+        default=1_000_000,
+        help="The total of random sequences to generate. Defaults to 1000000.",
+    )
+    parser.add_argument(
+        "--max-length",
+        type=int,
+        default=30,
+        help="The maximum total of moves of a sequence. Defaults to 30.",
+    )
+    parser.add_argument("--seed", type=int, help="The seed of the random generator.")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="The total of worker processes. Defaults to the total of CPUs.",
+    )
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=list(BACKENDS),
+        help="A backend to compare with the reference. Can be repeated. Defaults to all of them.",
+    )
+    args = parser.parse_args()
+
+    backends = None
+    if args.backend:
+        backends = {name: BACKENDS[name] for name in args.backend}
+    report = fuzz(
+        args.sequences,
+        backends,
+        max_length=args.max_length,
+        seed=args.seed,
+        processes=args.processes,
+    )
+
+    for mismatch in report.mismatches:
+        print(f"{mismatch.minimized} (from {mismatch.sequence})")
+        for name, (result, _) in mismatch.outcomes.items():
+            print(f"    {name}: {result}")
+    print(
+        f"{report.sequences} sequences in {report.seconds:.1f}s "
+        f"({report.sequences_per_second:.0f} sequences/s), "
+        f"{report.mismatched_sequences} mismatched"
+    )
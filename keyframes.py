@@ -0,0 +1,274 @@
+from dataclasses import dataclass
+import argparse
+import hashlib
+from typing import List
+
+import numpy as np
+from numpy import ndarray
+
+from factory import PIECE_IDS, PIECES
+from sequences import format_moves, parse_sequence
+from tetris_solver import TetrisSolver
+
+
+def keyframes_path(input_path: str) -> str:
+    """
+    The path the keyframe index of an input file is persisted to, next to the input.
+    """
+    return input_path + ".keyframes.npz"
+
+
+def moves_digest(moves: List[tuple[str, int]]) -> str:
+    """
+    Fingerprint of a sequence, stored with a persisted index to detect a changed input.
+    """
+    return hashlib.sha256(format_moves(moves).encode()).hexdigest()
+
+
+@dataclass
+class Keyframe:
+    """
+    Compact copy of everything which determines the outcome of the following placements.
+
+    - `move:int` - The total of moves placed before the keyframe was captured
+    - `grid_bits:ndarray[np.uint8]` - The grid, flattened and packed into bits
+    - `is_empty:bool` - Whether the solver was still waiting for its first polyominoe
+    - `piece_types:ndarray[np.uint8]` - The piece id of every polyominoe on the grid, in order
+    - `piece_sizes:ndarray[np.uint8]` - The total of cells left in the body of every polyominoe
+    - `cells:ndarray[np.int16]` - The `(row, column)` of the body cells of all the polyominoes, in order
+    """
+
+    move: int
+    grid_bits: ndarray[np.uint8]
+    is_empty: bool
+    piece_types: ndarray[np.uint8]
+    piece_sizes: ndarray[np.uint8]
+    cells: ndarray[np.int16]
+
+
+def capture_keyframe(tetris_solver: TetrisSolver, move: int) -> Keyframe:
+    """
+    Captures the state of a solver after `move` moves.
+    """
+    polyominoes = tetris_solver.polyominoes
+    cells = [
+        (cell.row_index, cell.col_index)
+        for polyominoe in polyominoes
+        for cell in polyominoe.body
+    ]
+    return Keyframe(
+        move=move,
+        grid_bits=np.packbits(tetris_solver.grid != 0),
+        is_empty=tetris_solver.is_empty,
+        piece_types=np.array(
+            [PIECE_IDS[type(polyominoe)] for polyominoe in polyominoes], dtype=np.uint8
+        ),
+        piece_sizes=np.array(
+            [len(polyominoe.body) for polyominoe in polyominoes], dtype=np.uint8
+        ),
+        cells=np.array(cells, dtype=np.int16).reshape(-1, 2),
+    )
+
+
+def restore_keyframe(tetris_solver: TetrisSolver, keyframe: Keyframe):
+    """
+    Restores a solver to the state of a keyframe, reusing the solver's grid and pooled polyominoes.
+    """
+    tetris_solver.reset()
+    grid = tetris_solver.grid
+    grid[...] = np.unpackbits(keyframe.grid_bits, count=grid.size).reshape(grid.shape)
+    tetris_solver.is_empty = keyframe.is_empty
+
+    # every filled row was touched since the last line clear, the other touched rows do not matter
+    row_counter = tetris_solver.row_counter
+    row_counter.counts = np.count_nonzero(grid, axis=1).tolist()
+    row_counter.touched_rows = [
+        row_index
+        for row_index, count in enumerate(row_counter.counts)
+        if count == tetris_solver.columns
+    ]
+
+    cells: List[List[int]] = keyframe.cells.tolist()
+    start = 0
+    for piece_id, size in zip(keyframe.piece_types.tolist(), keyframe.piece_sizes.tolist()):
+        polyominoe = tetris_solver.polyominoe_factory.create(PIECES[piece_id])
+        polyominoe.restore(cells[start : start + size])
+        tetris_solver.polyominoes.append(polyominoe)
+        start += size
+
+
+class KeyframeIndex:
+    """
+    Random access into a long game: keyframes of the solver are stored every `spacing` moves, and
+    `seek(k)` restores the nearest keyframe at or before move `k` and only replays the moves after it.
+    A smaller spacing uses more memory, a larger one replays more moves per seek.
+
+    Usage
+    -----
+    ```
+    index = KeyframeIndex.build(moves, spacing=10_000)
+    height = index.seek(1_234_567)
+    index.tetris_solver.grid  # the board after move 1,234,567
+    index.save(keyframes_path("game.txt"))
+    ```
+
+    Args
+    ----
+    - `moves:List[tuple[str, int]]` - The `(polyominoe, column_index)` moves of the game
+    - `keyframes:List[Keyframe]` - The keyframes, every `spacing` moves starting at move 0
+    - `spacing:int` - The total of moves between keyframes
+    - `rows:int`, `columns:int` - The grid dimensions
+    """
+
+    def __init__(
+        self,
+        moves: List[tuple[str, int]],
+        keyframes: List[Keyframe],
+        spacing: int,
+        rows: int = 10,
+        columns: int = 10,
+    ):
+        self.moves = moves
+        self.keyframes = keyframes
+        self.spacing = spacing
+        self.rows = rows
+        self.columns = columns
+        # restored and replayed by every seek
+        self.tetris_solver = TetrisSolver(rows, columns)
+
+    @classmethod
+    def build(
+        cls,
+        moves: List[tuple[str, int]],
+        spacing: int = 10_000,
+        rows: int = 10,
+        columns: int = 10,
+    ) -> "KeyframeIndex":
+        """
+        Solves the game once, capturing a keyframe every `spacing` moves.
+
+        Raises
+        ------
+        The error of the engine if it cannot compute a placement of the game
+        """
+        if spacing < 1:
+            raise ValueError("The keyframe spacing must be at least 1")
+
+        tetris_solver = TetrisSolver(rows, columns)
+        keyframes: List[Keyframe] = [capture_keyframe(tetris_solver, 0)]
+        for start in range(0, len(moves), spacing):
+            if start:
+                keyframes.append(capture_keyframe(tetris_solver, start))
+            tetris_solver.solve_moves(moves[start : start + spacing])
+        return cls(moves, keyframes, spacing, rows, columns)
+
+    def seek(self, move: int) -> int:
+        """
+        Restores the board after the first `move` moves into `tetris_solver`.
+
+        Returns
+        -------
+        The height of the board after `move` moves
+        """
+        if not 0 <= move <= len(self.moves):
+            raise ValueError(f"The move must be between 0 and {len(self.moves)}")
+
+        keyframe = self.keyframes[min(move // self.spacing, len(self.keyframes) - 1)]
+        restore_keyframe(self.tetris_solver, keyframe)
+        return int(self.tetris_solver.solve_moves(self.moves[keyframe.move : move]))
+
+    def save(self, path: str):
+        """
+        Persists the keyframes with a digest of the moves, the spacing and the grid dimensions.
+        """
+        np.savez_compressed(
+            path,
+            digest=np.array(moves_digest(self.moves)),
+            dimensions=np.array(
+                [self.rows, self.columns, self.spacing, len(self.moves)]
+            ),
+            keyframe_moves=np.array([keyframe.move for keyframe in self.keyframes]),
+            grid_bits=np.stack([keyframe.grid_bits for keyframe in self.keyframes]),
+            is_empty=np.array([keyframe.is_empty for keyframe in self.keyframes]),
+            piece_counts=np.array(
+                [len(keyframe.piece_types) for keyframe in self.keyframes]
+            ),
+            piece_types=np.concatenate(
+                [keyframe.piece_types for keyframe in self.keyframes]
+            ),
+            piece_sizes=np.concatenate(
+                [keyframe.piece_sizes for keyframe in self.keyframes]
+            ),
+            cells=np.concatenate([keyframe.cells for keyframe in self.keyframes]),
+        )
+
+    @classmethod
+    def load(cls, path: str, moves: List[tuple[str, int]]) -> "KeyframeIndex":
+        """
+        Loads keyframes persisted by `save` for the same moves.
+
+        Raises
+        ------
+        `ValueError` if the keyframes were built for different moves
+        """
+        with np.load(path) as data:
+            if str(data["digest"]) != moves_digest(moves):
+                raise ValueError(f"The keyframes in {path} were built for other moves")
+            rows, columns, spacing, _ = data["dimensions"].tolist()
+
+            piece_counts: ndarray[int] = data["piece_counts"]
+            piece_ends = np.cumsum(piece_counts)
+            cell_ends = np.cumsum(data["piece_sizes"])
+            piece_types = np.split(data["piece_types"], piece_ends[:-1])
+            piece_sizes = np.split(data["piece_sizes"], piece_ends[:-1])
+            # the cells of a keyframe end with the last cell of its last polyominoe
+            keyframe_cell_ends = [
+                int(cell_ends[piece_end - 1]) if piece_end else 0
+                for piece_end in piece_ends[:-1].tolist()
+            ]
+            cells = np.split(data["cells"], keyframe_cell_ends)
+
+            keyframes = [
+                Keyframe(move, grid_bits, bool(is_empty), types, sizes, keyframe_cells)
+                for move, grid_bits, is_empty, types, sizes, keyframe_cells in zip(
+                    data["keyframe_moves"].tolist(),
+                    data["grid_bits"],
+                    data["is_empty"],
+                    piece_types,
+                    piece_sizes,
+                    cells,
+                )
+            ]
+        return cls(moves, keyframes, spacing, rows, columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Builds or uses the keyframe index of a game stored in a file"
+    )
+    parser.add_argument(
+        "input_path",
+        help="Path of a file with a comma-separated sequence of Tetris pieces. For example: 'Q0,Q1'",
+    )
+    parser.add_argument(
+        "--spacing",
+        type=int,
+        default=10_000,
+        help="The total of moves between keyframes when building the index. Defaults to 10000.",
+    )
+    parser.add_argument(
+        "--seek",
+        type=int,
+        help="If provided, prints the height after this many moves, using the index next to the input.",
+    )
+    args = parser.parse_args()
+
+    with open(args.input_path) as input_file:
+        moves = parse_sequence(input_file.read().strip())
+
+    index_path = keyframes_path(args.input_path)
+    if args.seek is None:
+        KeyframeIndex.build(moves, args.spacing).save(index_path)
+        print(index_path)
+    else:
+        print(KeyframeIndex.load(index_path, moves).seek(args.seek))
@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from numpy import ndarray
+
+
+@dataclass
+class BoardFeatures:
+    """
+    Features of a grid, or of every grid of a `(N, rows, columns)` stack.
+    For a single grid the scalar features are 0-d arrays, for a stack they have shape `(N,)`.
+
+    - `column_heights` - The height of the top most occupied cell of every column, `(..., columns)`
+    - `aggregate_height` - The sum of the column heights
+    - `bumpiness` - The sum of the absolute height differences between adjacent columns
+    - `holes` - The total of empty cells which have an occupied cell above them in the same column
+    - `row_transitions` - The total of occupied/empty changes between horizontally adjacent cells.
+    The walls count as occupied cells, so an empty row has 2 transitions
+    - `well_depths` - How much lower every column is than both of its neighbors, `(..., columns)`.
+    The walls count as infinitely high neighbors
+    """
+
+    column_heights: ndarray[int]
+    aggregate_height: ndarray[int]
+    bumpiness: ndarray[int]
+    holes: ndarray[int]
+    row_transitions: ndarray[int]
+    well_depths: ndarray[int]
+
+
+def compute_column_heights(grids: ndarray[int]) -> ndarray[int]:
+    """
+    Computes the height of every column of a grid, or of a `(N, rows, columns)` stack of grids.
+    """
+    occupied: ndarray[bool] = grids != 0
+    rows = grids.shape[-2]
+    # index of the first occupied cell from the top, or `rows` if the column is empty
+    top_row_indices = np.where(
+        occupied.any(axis=-2), occupied.argmax(axis=-2), rows
+    )
+    return rows - top_row_indices
+
+
+def compute_row_transitions(grids: ndarray[int]) -> ndarray[int]:
+    """
+    Computes the total of transitions of every row of a grid, or of a `(N, rows, columns)` stack.
+
+    Returns
+    -------
+    An array with shape `(..., rows)`
+    """
+    occupied: ndarray[bool] = grids != 0
+    inner_transitions = (occupied[..., 1:] != occupied[..., :-1]).sum(axis=-1)
+    # the walls are occupied, so an empty cell next to a wall is also a transition
+    wall_transitions = (~occupied[..., 0]).astype(int) + (~occupied[..., -1])
+    return inner_transitions + wall_transitions
+
+
+def _column_features(
+    column_heights: ndarray[int], column_counts: ndarray[int]
+) -> tuple[ndarray[int], ...]:
+    """
+    Computes the features which only depend on the column heights and the total of occupied cells
+    of every column.
+
+    Returns
+    -------
+    A tuple with the aggregate height, bumpiness, holes and well depths
+    """
+    aggregate_height = column_heights.sum(axis=-1)
+    bumpiness = np.abs(np.diff(column_heights, axis=-1)).sum(axis=-1)
+    holes = (column_heights - column_counts).sum(axis=-1)
+
+    # pad both sides with walls which are higher than any column
+    wall_height = np.iinfo(column_heights.dtype).max
+    wall = np.full(column_heights.shape[:-1] + (1,), wall_height)
+    padded_heights = np.concatenate((wall, column_heights, wall), axis=-1)
+    lowest_neighbors = np.minimum(padded_heights[..., :-2], padded_heights[..., 2:])
+    # a single column between two walls is not a well
+    well_depths = np.where(
+        lowest_neighbors == wall_height,
+        0,
+        np.maximum(lowest_neighbors - column_heights, 0),
+    )
+
+    return aggregate_height, bumpiness, holes, well_depths
+
+
+def compute_features(grids: ndarray[int]) -> BoardFeatures:
+    """
+    Computes all the `BoardFeatures` of a grid, or of a `(N, rows, columns)` stack of grids,
+    with a few vectorized passes.
+    """
+    column_heights = compute_column_heights(grids)
+    column_counts = np.count_nonzero(grids, axis=-2)
+    aggregate_height, bumpiness, holes, well_depths = _column_features(
+        column_heights, column_counts
+    )
+    row_transitions = compute_row_transitions(grids).sum(axis=-1)
+    return BoardFeatures(
+        column_heights,
+        aggregate_height,
+        bumpiness,
+        holes,
+        row_transitions,
+        well_depths,
+    )
+
+
+class IncrementalFeatures:
+    """
+    Keeps the `BoardFeatures` of a single grid up to date from the cells changed by every placement.
+    Column heights, occupied cell counts and row transitions are stored per column and per row, and
+    only the columns and rows which contain changed cells are recomputed.
+
+    Usage
+    -----
+    ```
+    tetris_solver = TetrisSolver(record_changes=True)
+    features = IncrementalFeatures(tetris_solver.grid)
+    for move in moves:
+        tetris_solver.solve_moves([move])
+        features.update(tetris_solver.grid, tetris_solver.changed_cells)
+        features.features
+    ```
+    The changed cells of a solver include the cleared rows and the cells of every shifted polyominoe.
+    If the grid changes in any other way, call `refresh`.
+    """
+
+    def __init__(self, grid: ndarray[int]):
+        self.refresh(grid)
+
+    def refresh(self, grid: ndarray[int]):
+        """
+        Recomputes all the features from the whole grid.
+        """
+        self.column_heights: ndarray[int] = compute_column_heights(grid)
+        self.column_counts: ndarray[int] = np.count_nonzero(grid, axis=0)
+        self.row_transitions: ndarray[int] = compute_row_transitions(grid)
+        self.features: BoardFeatures = self.__build_features()
+
+    def update(self, grid: ndarray[int], changed_cells: Iterable[tuple[int, int]]):
+        """
+        Updates the features after the given cells of the grid changed.
+
+        Args
+        ----
+        - `grid:ndarray[int]` - The grid, after the change
+        - `changed_cells:Iterable[tuple[int, int]]` - The `(row_index, column_index)` of every changed cell
+        """
+        rows, columns = grid.shape
+        changed_cells = list(changed_cells)
+        changed_rows = sorted({row_index % rows for row_index, _ in changed_cells})
+        changed_columns = sorted(
+            {column_index % columns for _, column_index in changed_cells}
+        )
+        if not changed_rows:
+            return
+
+        changed_row_grid = grid[changed_rows]
+        self.row_transitions[changed_rows] = compute_row_transitions(changed_row_grid)
+        column_grid = grid[:, changed_columns]
+        self.column_heights[changed_columns] = compute_column_heights(column_grid)
+        self.column_counts[changed_columns] = np.count_nonzero(column_grid, axis=0)
+        self.features = self.__build_features()
+
+    def __build_features(self) -> BoardFeatures:
+        aggregate_height, bumpiness, holes, well_depths = _column_features(
+            self.column_heights, self.column_counts
+        )
+        return BoardFeatures(
+            self.column_heights.copy(),
+            aggregate_height,
+            bumpiness,
+            holes,
+            self.row_transitions.sum(),
+            well_depths,
+        )
@@ -1,30 +1,126 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 import sys
-from typing import List
+from typing import List, Sequence
 
 import numpy as np
 from numpy import ndarray
 
 
-@dataclass
+# Returned by `RowCounter.pop_filled_rows` for the moves which fill no row, so they allocate nothing
+NO_FILLED_ROWS: tuple[int, ...] = ()
+
+
+class WrappedPolyominoeError(AttributeError):
+    """
+    Raised when a polyominoe which wrapped around to negative rows must be shifted down after a line
+    clear: a column of its body has no collider cell, so the engine cannot compute the shift.
+
+    It subclasses `AttributeError`, which the engine used to raise in this case.
+    """
+
+    def __init__(self, polyominoe_type: str):
+        self.polyominoe_type = polyominoe_type
+        super().__init__(
+            f"The {polyominoe_type} polyominoe wrapped around the grid and cannot be shifted down"
+        )
+
+
+@dataclass(slots=True)
 class Cell:
     row_index: int
     col_index: int
 
 
+class RowCounter:
+    """
+    Keeps the total of occupied cells of every row of the grid, updated whenever a polyominoe occupies
+    or frees a cell. Rows which gained cells are remembered, so filled rows can be found by checking
+    only those rows instead of scanning the whole grid.
+    """
+
+    __slots__ = ("counts", "touched_rows")
+
+    def __init__(self, rows: int):
+        self.counts: List[int] = [0] * rows
+        self.touched_rows: List[int] = []
+
+    def occupy(self, grid: ndarray[int], row_index: int, column_index: int):
+        """
+        Sets the cell to occupied (1)
+        """
+        if grid[row_index, column_index] == 0:
+            self.counts[row_index] += 1
+            self.touched_rows.append(row_index)
+        grid[row_index, column_index] = 1
+
+    def free(self, grid: ndarray[int], row_index: int, column_index: int):
+        """
+        Sets the cell to empty (0)
+        """
+        if grid[row_index, column_index] == 1:
+            self.counts[row_index] -= 1
+        grid[row_index, column_index] = 0
+
+    def pop_filled_rows(self, columns: int) -> Sequence[int]:
+        """
+        Gets the rows which are filled, out of the rows which gained cells since the last call.
+
+        Returns
+        -------
+        The sorted indices of the filled rows, or `NO_FILLED_ROWS`
+        """
+        counts = self.counts
+        for row_index in self.touched_rows:
+            if counts[row_index] == columns:
+                break
+        else:
+            self.touched_rows.clear()
+            return NO_FILLED_ROWS
+
+        row_count = len(counts)
+        filled_rows = sorted(
+            {
+                row_index % row_count
+                for row_index in self.touched_rows
+                if counts[row_index] == columns
+            }
+        )
+        self.touched_rows.clear()
+        return filled_rows
+
+    def clear_row(self, row_index: int):
+        self.counts[row_index] = 0
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.touched_rows.clear()
+
+
 class AbstractPolyominoe(ABC):
     """
     Interface for all concrete Polyominoe implementations
+
+    Instances are slotted and own a fixed set of four `Cell`'s which are reused every time the
+    polyominoe is added to the grid, so a pooled polyominoe can be placed without allocating.
     """
 
+    __slots__ = ("type", "removed_row_index", "body", "_cells")
+
     def __init__(self, type):
         self.type: str = type
         self.removed_row_index: int | None = None
         self.body: List[Cell] = []
+        self._cells: tuple[Cell, ...] = tuple(Cell(0, 0) for _ in range(4))
 
     @abstractmethod
-    def add(self, grid: ndarray[int], start_cell: dict):
+    def add(
+        self,
+        grid: ndarray[int],
+        row_index: int,
+        column_index: int,
+        row_counter: RowCounter,
+    ):
         """
         Adds the polyminoe to the grid once the Tetris engine has computed its location.
         This sets all cells within the polyminoe's shape to occupied.
@@ -32,11 +128,65 @@ class AbstractPolyominoe(ABC):
         Args
         ----
         - `grid` - The tetris grid
-        - `start_cell:dict` - A dictionary containing the row and column index of the initial cell the polyminoe
-        will be added to
+        - `row_index:int` - The row index of the initial cell the polyminoe will be added to
+        - `column_index:int` - The column index of the initial cell the polyminoe will be added to
+        - `row_counter:RowCounter` - The occupied cell counter of the grid rows
         """
         pass
 
+    @classmethod
+    def width(cls) -> int:
+        """
+        The total of columns of the grid that the polyminoe occupies
+        """
+        return max(col_offset for _, col_offset in cls.OFFSETS) + 1
+
+    def _occupy(
+        self,
+        grid: ndarray[int],
+        row_index: int,
+        column_index: int,
+        offsets: tuple[tuple[int, int], ...],
+        row_counter: RowCounter,
+    ):
+        """
+        Moves the polyminoe's cells to the given location and sets them to occupied in the grid.
+
+        Args
+        ----
+        - `grid` - The tetris grid
+        - `row_index:int` - The row index of the initial cell
+        - `column_index:int` - The column index of the initial cell
+        - `offsets` - The `(row, column)` offset of each cell of the shape relative to the initial cell
+        - `row_counter:RowCounter` - The occupied cell counter of the grid rows
+        """
+        body = self.body
+        body.clear()
+        for cell, (row_offset, col_offset) in zip(self._cells, offsets):
+            cell.row_index = row_index + row_offset
+            cell.col_index = column_index + col_offset
+            body.append(cell)
+            row_counter.occupy(grid, cell.row_index, cell.col_index)
+
+    def restore(self, cells: List[tuple[int, int]]):
+        """
+        Moves the polyminoe's body to the given `(row, column)` cells, in order, without updating the grid.
+        Used to restore a saved solver state, where the grid is restored separately.
+        """
+        body = self.body
+        body.clear()
+        for cell, (row_index, col_index) in zip(self._cells, cells):
+            cell.row_index = row_index
+            cell.col_index = col_index
+            body.append(cell)
+
+    def reset(self):
+        """
+        Clears the state of the polyminoe so it can be reused by the `PolyominoeFactory`
+        """
+        self.body.clear()
+        self.removed_row_index = None
+
     @abstractmethod
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         """
@@ -117,11 +267,17 @@ class AbstractPolyominoe(ABC):
         Returns
         -------
         `True` if the polyominoe can be moved down, otherwhise `False`
+
+        Raises
+        ------
+        `WrappedPolyominoeError` if a column has no collider cell
         """
 
         polyominoe_smallest_row_index = sys.maxsize
         for cell in polyminoe_collider_cells:
-            cell.row_index
+            if cell is None:
+                # all the cells of its column are on negative rows, see `__get_collider_cells`
+                raise WrappedPolyominoeError(self.type)
             if cell.row_index < polyominoe_smallest_row_index:
                 polyominoe_smallest_row_index = cell.row_index
 
@@ -173,7 +329,7 @@ class AbstractPolyominoe(ABC):
         # Return the minimum vertical shift required for alignment
         return smallest_delta
 
-    def shift_down(self, grid: ndarray[int]):
+    def shift_down(self, grid: ndarray[int], row_counter: RowCounter):
         """
         Shifts the polyominoe down to a free space after a filled row as been destroyed.
         The polyominoe will only be moved if its above the removed filled row
@@ -207,9 +363,9 @@ class AbstractPolyominoe(ABC):
 
         # shift the polyminoe downwards by the computed shift_unit
         for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 0
+            row_counter.free(grid, occupied_cell.row_index, occupied_cell.col_index)
             occupied_cell.row_index = shift_unit + occupied_cell.row_index
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+            row_counter.occupy(grid, occupied_cell.row_index, occupied_cell.col_index)
 
     def remove(self, filled_row_index: int):
         """
@@ -224,8 +380,13 @@ class AbstractPolyominoe(ABC):
         `True` if the polyminoe was completely removed from the grid. If it was split,
         `False` will be returned.
         """
-        self.body = [cell for cell in self.body if cell.row_index != filled_row_index]
+        body = self.body
+        # delete in place, from the back, so the order of the remaining cells is preserved
+        for index in range(len(body) - 1, -1, -1):
+            if body[index].row_index == filled_row_index:
+                del body[index]
         self.removed_row_index = filled_row_index
+        return len(body) == 0
 
 
 class QPolyminoe(AbstractPolyominoe):
@@ -236,22 +397,16 @@ class QPolyminoe(AbstractPolyominoe):
     ```
     """
 
-    def __init__(self):
-        super().__init__("QPolyminoe")
+    __slots__ = ()
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (-1, 0), (-1, 1), (0, 1))
 
-        self.body = [
-            Cell(row, col),
-            Cell(row - 1, col),
-            Cell(row - 1, col + 1),
-            Cell(row, col + 1),
-        ]
+    def __init__(self):
+        super().__init__("QPolyminoe")
 
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         if grid[row_index + 1, column_index] == 1:
@@ -268,22 +423,16 @@ class IPolyminoe(AbstractPolyominoe):
     ```
     """
 
-    def __init__(self):
-        super().__init__("IPolyminoe")
+    __slots__ = ()
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (0, 1), (0, 2), (0, 3))
 
-        self.body = [
-            Cell(row, col),
-            Cell(row, col + 1),
-            Cell(row, col + 2),
-            Cell(row, col + 3),
-        ]
+    def __init__(self):
+        super().__init__("IPolyminoe")
 
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         """
@@ -312,34 +461,25 @@ class TPolyminoe(AbstractPolyominoe):
     ```
     """
 
+    __slots__ = ()
+
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (0, 1), (0, 2), (1, 1))
+    # move up one row to place the left part of the T when the initial cell is in the bottom row
+    BOTTOM_ROW_OFFSETS = ((-1, 0), (-1, 1), (-1, 2), (0, 1))
+
     def __init__(self):
         super().__init__("TPolyminoe")
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        # represents the index of the left-most column of the grid that the shape occupies, starting from zero.
-        col = start_cell["column"]
-
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        # column_index represents the index of the left-most column of the grid that the shape occupies, starting from zero.
         row_count = grid.shape[0]
-        if row == row_count - 1:
-            row_offset = -1  # move up one row to place the left part of the T
-            self.body = [
-                Cell(row + row_offset, col),
-                Cell(row + row_offset, col + 1),
-                Cell(row + row_offset, col + 2),
-                Cell(row, col + 1),
-            ]
-
+        if row_index == row_count - 1:
+            self._occupy(
+                grid, row_index, column_index, self.BOTTOM_ROW_OFFSETS, row_counter
+            )
         else:
-            self.body = [
-                Cell(row, col),
-                Cell(row, col + 1),
-                Cell(row, col + 2),
-                Cell(row + 1, col + 1),
-            ]
-
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+            self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         # NOTE: to handle rotation, we would need to implement a specifc collision algo for each rotation (90,180,270)
@@ -367,21 +507,16 @@ class ZPolyminoe(AbstractPolyominoe):
     ```
     """
 
+    __slots__ = ()
+
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (0, 1), (1, 1), (1, 2))
+
     def __init__(self):
         super().__init__("ZPolyminoe")
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
-        self.body = [
-            Cell(row, col),
-            Cell(row, col + 1),
-            Cell(row + 1, col + 1),
-            Cell(row + 1, col + 2),
-        ]
-
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         # checks if top left leg has a colliding cell underneath it
@@ -407,21 +542,16 @@ class SPolyminoe(AbstractPolyominoe):
     ```
     """
 
+    __slots__ = ()
+
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (0, 1), (-1, 1), (-1, 2))
+
     def __init__(self):
         super().__init__("SPolyminoe")
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
-        self.body = [
-            Cell(row, col),
-            Cell(row, col + 1),
-            Cell(row - 1, col + 1),
-            Cell(row - 1, col + 2),
-        ]
-
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         # checks if bottom left leg has a colliding cell underneath it
@@ -448,21 +578,16 @@ class LPolyminoe(AbstractPolyominoe):
     ```
     """
 
+    __slots__ = ()
+
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (-1, 0), (-2, 0), (0, 1))
+
     def __init__(self):
         super().__init__("LPolyminoe")
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
-        self.body = [
-            Cell(row, col),
-            Cell(row - 1, col),
-            Cell(row - 2, col),
-            Cell(row, col + 1),
-        ]
-
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         # checks if center has a colliding cell underneath it
@@ -485,21 +610,16 @@ class JPolyminoe(AbstractPolyominoe):
     ```
     """
 
+    __slots__ = ()
+
+    # (row, column) offset of each cell relative to the initial cell
+    OFFSETS = ((0, 0), (0, 1), (-1, 1), (-2, 1))
+
     def __init__(self):
         super().__init__("JPolyminoe")
 
-    def add(self, grid, start_cell: dict):
-        row = start_cell["row"]
-        col = start_cell["column"]
-        self.body = [
-            Cell(row, col),
-            Cell(row, col + 1),
-            Cell(row - 1, col + 1),
-            Cell(row - 2, col + 1),
-        ]
-
-        for occupied_cell in self.body:
-            grid[occupied_cell.row_index, occupied_cell.col_index] = 1
+    def add(self, grid, row_index: int, column_index: int, row_counter: RowCounter):
+        self._occupy(grid, row_index, column_index, self.OFFSETS, row_counter)
 
     def check_collision(self, grid, row_index: int, column_index: int) -> bool:
         # checks if center has a colliding cell underneath it
@@ -0,0 +1,161 @@
+import sqlite3
+
+# NOTE: This module must not import numpy (directly or through the engine), so cache hits stay
+# a single indexed read.
+
+# Bump whenever a change to the engine can change the height of a sequence. Opening a cache written
+# by another version discards all of its entries.
+ENGINE_VERSION = 1
+
+
+class PersistentCache:
+    """
+    On-disk cache of sequence heights backed by sqlite, which can be shared by many processes.
+
+    Keys are normalized sequences built with `sequences.sequence_key`, for example `10x10:Q0,Q1`.
+    The database uses write-ahead logging so readers do not block writers, and concurrent writers
+    wait for each other for up to `timeout` seconds.
+    Once the cache holds more than `max_entries` entries, the least recently written ones are evicted.
+
+    Usage
+    -----
+    ```
+    with PersistentCache("heights.sqlite") as cache:
+        height = cache.get("10x10:Q0,Q1")
+    ```
+
+    Args
+    ----
+    - `path:str` - The path of the sqlite database file
+    - `max_entries:int` - The maximum total of entries kept
+    - `version:int` - The engine version the entries are valid for
+    - `timeout:float` - The seconds to wait for the database lock
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1_000_000,
+        version: int = ENGINE_VERSION,
+        timeout: float = 30,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = version
+        # autocommit mode, transactions are opened explicitly
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.__init_schema()
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
+
+    def __read_metadata(self) -> dict[str, str]:
+        try:
+            return dict(self.connection.execute("SELECT name, value FROM metadata"))
+        except sqlite3.OperationalError:
+            # the tables were not created yet
+            return {}
+
+    def __is_current(self, metadata: dict[str, str]) -> bool:
+        return metadata.get("version") == str(self.version) and "entries" in metadata
+
+    def __init_schema(self):
+        """
+        Creates the tables if they do not exist yet, and discards all the entries if they were
+        written by a different engine version.
+
+        Opening an up to date cache only reads the metadata, without taking the write lock.
+        """
+        if self.__is_current(self.__read_metadata()):
+            return
+
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            # the rowid increases with every write, so the smallest ones are the least recently written entries
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS heights ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "key TEXT NOT NULL UNIQUE, "
+                "height INTEGER NOT NULL)"
+            )
+            # another process may have initialized the cache while this one waited for the lock
+            metadata = self.__read_metadata()
+            if metadata.get("version") != str(self.version):
+                self.connection.execute("DELETE FROM heights")
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO metadata (name, value) VALUES ('version', ?)",
+                    (str(self.version),),
+                )
+            # the total of entries is kept up to date by `set`, so it is only counted once
+            self.connection.execute(
+                "INSERT OR REPLACE INTO metadata (name, value) "
+                "VALUES ('entries', (SELECT COUNT(*) FROM heights))"
+            )
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> int | None:
+        """
+        Gets the cached height of a normalized sequence.
+
+        Returns
+        -------
+        The height, or `None` if the sequence is not cached
+        """
+        row = self.connection.execute(
+            "SELECT height FROM heights WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key: str, height: int):
+        """
+        Stores the height of a normalized sequence, evicting the least recently written entries if the
+        cache is full.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            is_new = (
+                self.connection.execute(
+                    "SELECT 1 FROM heights WHERE key = ?", (key,)
+                ).fetchone()
+                is None
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO heights (key, height) VALUES (?, ?)",
+                (key, int(height)),
+            )
+            if is_new:
+                # rewriting a key replaces its row, so ids have gaps and do not count the entries
+                entries = self.connection.execute(
+                    "UPDATE metadata SET value = CAST(value AS INTEGER) + 1 "
+                    "WHERE name = 'entries' RETURNING CAST(value AS INTEGER)"
+                ).fetchall()[0][0]
+                if entries > self.max_entries:
+                    self.connection.execute(
+                        "DELETE FROM heights WHERE id IN ("
+                        "SELECT id FROM heights ORDER BY id LIMIT ?)",
+                        (entries - self.max_entries,),
+                    )
+                    self.connection.execute(
+                        "UPDATE metadata SET value = ? WHERE name = 'entries'",
+                        (str(self.max_entries),),
+                    )
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return int(self.__read_metadata()["entries"])
+
+    def close(self):
+        self.connection.close()
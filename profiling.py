@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING, List
+
+from models import AbstractPolyominoe, Cell
+
+if TYPE_CHECKING:
+    from tetris_solver import TetrisSolver
+
+# Subsystems which are measured on every sample
+SUBSYSTEMS = ("traced", "grid", "polyominoes", "pool", "cells")
+
+
+def _polyominoes_size(polyominoes: List[AbstractPolyominoe]) -> int:
+    """
+    The bytes used by the polyominoe objects and their body lists, without their cells
+    """
+    return sum(
+        sys.getsizeof(polyominoe) + sys.getsizeof(polyominoe.body)
+        for polyominoe in polyominoes
+    )
+
+
+class MemoryBudgetExceeded(Exception):
+    """
+    Raised when the memory traced by a profiled solve is larger than the configured budget.
+    """
+
+    def __init__(self, move: int, traced_bytes: int, budget_bytes: int):
+        self.move = move
+        self.traced_bytes = traced_bytes
+        self.budget_bytes = budget_bytes
+        super().__init__(
+            f"Peak traced memory of {traced_bytes} bytes by move {move} "
+            f"exceeds the budget of {budget_bytes} bytes"
+        )
+
+
+@dataclass
+class MemorySample:
+    """
+    Memory used by each subsystem of the solver after a given move.
+
+    - `move:int` - The total of moves placed by the profiled solvers when the sample was taken
+    - `subsystem_bytes:dict[str, int]` - The bytes used by each of the `SUBSYSTEMS`
+    - `live_polyominoes:int`, `pooled_polyominoes:int`, `cells:int` - Object counts
+    """
+
+    move: int
+    subsystem_bytes: dict[str, int]
+    live_polyominoes: int
+    pooled_polyominoes: int
+    cells: int
+
+
+@dataclass
+class SubsystemReport:
+    """
+    - `peak:int` - The largest sampled bytes. For the traced memory, the peak traced by `tracemalloc`
+    - `steady_state:int` - The mean bytes of the last half of the samples
+    """
+
+    peak: int
+    steady_state: int
+
+
+class MemoryProfiler:
+    """
+    Samples the memory used by a `TetrisSolver` every `sample_every` moves, using `tracemalloc` for the
+    total traced memory and object counts for the grid, the live and pooled polyominoes and their cells.
+
+    Usage
+    -----
+    ```
+    with MemoryProfiler(sample_every=1000, budget_bytes=10_000_000) as profiler:
+        TetrisSolver(memory_profiler=profiler).solve(sequence)
+    print(profiler.report())
+    ```
+
+    Args
+    ----
+    - `sample_every:int` - The total of moves between samples
+    - `budget_bytes:int` - If provided, `MemoryBudgetExceeded` is raised as soon as a sample finds that
+    the peak traced memory exceeded the budget. A last sample is taken at the end of every solve
+
+    If `tracemalloc` is not tracing yet, the profiler starts it at the first recorded move, and `stop`
+    stops it again.
+    """
+
+    def __init__(self, sample_every: int = 1000, budget_bytes: int | None = None):
+        self.sample_every = sample_every
+        self.budget_bytes = budget_bytes
+        self.samples: List[MemorySample] = []
+        self.moves = 0
+        self.peak_traced_bytes = 0
+        self.started_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exception_info):
+        self.stop()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            self.peak_traced_bytes = max(
+                self.peak_traced_bytes, tracemalloc.get_traced_memory()[1]
+            )
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def record_move(self, tetris_solver: "TetrisSolver"):
+        """
+        Counts a placed move, sampling the solver once every `sample_every` moves.
+        """
+        if not self.started_tracing:
+            # without tracing the traced memory reads 0 and the budget would never be exceeded
+            self.start()
+        self.moves += 1
+        if self.moves % self.sample_every == 0:
+            self.sample(tetris_solver)
+
+    def record_end(self, tetris_solver: "TetrisSolver"):
+        """
+        Samples the solver at the end of a solve, unless its last move was already sampled, so runs
+        shorter than `sample_every` moves are also measured and checked against the budget.
+        """
+        if not self.samples or self.samples[-1].move != self.moves:
+            self.sample(tetris_solver)
+
+    def sample(self, tetris_solver: "TetrisSolver") -> MemorySample:
+        """
+        Measures the memory of the solver's subsystems.
+
+        Raises
+        ------
+        `MemoryBudgetExceeded` if the peak traced memory, also between samples, is larger than `budget_bytes`
+        """
+        live_polyominoes: List[AbstractPolyominoe] = tetris_solver.polyominoes
+        pooled_polyominoes: List[AbstractPolyominoe] = [
+            polyominoe
+            for pool in tetris_solver.polyominoe_factory.pool.values()
+            for polyominoe in pool
+        ]
+        # every polyominoe owns its cells, whether it is on the grid or pooled
+        cells = sum(
+            len(polyominoe._cells)
+            for polyominoe in live_polyominoes + pooled_polyominoes
+        )
+        traced_bytes, peak_traced_bytes = tracemalloc.get_traced_memory()
+        self.peak_traced_bytes = max(self.peak_traced_bytes, peak_traced_bytes)
+
+        sample = MemorySample(
+            move=self.moves,
+            subsystem_bytes={
+                "traced": traced_bytes,
+                "grid": tetris_solver.grid.nbytes,
+                "polyominoes": sys.getsizeof(live_polyominoes)
+                + _polyominoes_size(live_polyominoes),
+                "pool": _polyominoes_size(pooled_polyominoes),
+                "cells": cells * sys.getsizeof(Cell(0, 0)),
+            },
+            live_polyominoes=len(live_polyominoes),
+            pooled_polyominoes=len(pooled_polyominoes),
+            cells=cells,
+        )
+        self.samples.append(sample)
+
+        if self.budget_bytes is not None and self.peak_traced_bytes > self.budget_bytes:
+            raise MemoryBudgetExceeded(
+                self.moves, self.peak_traced_bytes, self.budget_bytes
+            )
+        return sample
+
+    def report(self) -> dict[str, SubsystemReport]:
+        """
+        Summarizes the samples per subsystem.
+
+        Returns
+        -------
+        A dictionary with a `SubsystemReport` for each of the `SUBSYSTEMS`
+        """
+        if not self.samples:
+            return {}
+
+        steady_samples = self.samples[len(self.samples) // 2 :]
+        report: dict[str, SubsystemReport] = {}
+        for subsystem in SUBSYSTEMS:
+            peak = max(sample.subsystem_bytes[subsystem] for sample in self.samples)
+            if subsystem == "traced":
+                # tracemalloc also keeps the peak between samples
+                peak = max(peak, self.peak_traced_bytes)
+            steady_state = sum(
+                sample.subsystem_bytes[subsystem] for sample in steady_samples
+            ) // len(steady_samples)
+            report[subsystem] = SubsystemReport(peak, steady_state)
+        return report
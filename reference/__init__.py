@@ -0,0 +1,7 @@
+"""
+Frozen copy of the engine as it was before the performance work: `models.py`, `factory.py` and
+`tetris_solver.py` of the first commit, with only their imports changed to this package.
+
+`fuzz.py` compares every optimized backend against it. Do not change or optimize these modules, a fix
+to the engine must be made in the top-level modules and show up as a mismatch.
+"""
@@ -0,0 +1,145 @@
+from io import StringIO
+import sys
+from typing import List, TextIO
+
+import numpy as np
+from numpy import ndarray
+
+# Total of cells packed in a single byte by `np.packbits`
+CELLS_PER_BYTE = 8
+
+
+def _byte_strings(cell_count: int, separator: str) -> ndarray[str]:
+    """
+    Builds the lookup table from a packed byte to the text of its `cell_count` left-most cells.
+
+    Returns
+    -------
+    An object array with 256 entries. For example the entry for `0b10100000` with `cell_count=3` is `"1 0 1"`
+    """
+    return np.array(
+        [
+            " ".join(f"{byte:08b}"[:cell_count]) + separator
+            for byte in range(1 << CELLS_PER_BYTE)
+        ],
+        dtype=object,
+    )
+
+
+class BoardRenderer:
+    """
+    Formats tetris grids as text, with the same layout as `np.savetxt(..., fmt="%d", delimiter=" ")`.
+    Rows are packed into bytes and each byte is converted to text with a precomputed lookup table,
+    instead of formatting cell by cell.
+    """
+
+    def __init__(self, columns: int):
+        self.columns = columns
+        self.byte_count = -(-columns // CELLS_PER_BYTE)
+        last_cell_count = columns - (self.byte_count - 1) * CELLS_PER_BYTE
+        # all the bytes except the last one are followed by the separator of the next cell
+        self.byte_strings: ndarray[str] = _byte_strings(CELLS_PER_BYTE, " ")
+        self.last_byte_strings: ndarray[str] = _byte_strings(last_cell_count, "")
+
+    def render_rows(self, rows: ndarray[int]) -> List[str]:
+        """
+        Formats each row of a `(..., columns)` array of cells, without line breaks.
+        """
+        packed: ndarray[np.uint8] = np.packbits(rows, axis=-1).reshape(
+            -1, self.byte_count
+        )
+        row_strings = np.concatenate(
+            (
+                self.byte_strings[packed[:, :-1]],
+                self.last_byte_strings[packed[:, -1:]],
+            ),
+            axis=1,
+        )
+        return ["".join(row_string) for row_string in row_strings.tolist()]
+
+    def render(self, grids: ndarray[int]) -> str:
+        """
+        Formats a single grid, or a `(N, rows, columns)` stack of grids, one row per line.
+        """
+        row_strings = self.render_rows(grids)
+        row_strings.append("")
+        return "\n".join(row_strings)
+
+    def write(self, grids: ndarray[int], stream: TextIO | None = None):
+        """
+        Formats a `(N, rows, columns)` stack of grids and writes them with a single buffered write.
+        Boards are separated by an empty line.
+
+        Args
+        ----
+        - `grids:ndarray[int]` - The stack of grids
+        - `stream:TextIO` - The output stream, `sys.stdout` by default
+        """
+        stream = stream or sys.stdout
+        board_count, rows, _ = grids.shape
+        row_strings = self.render_rows(grids)
+        buffer = StringIO()
+        for board_index in range(board_count):
+            start = board_index * rows
+            buffer.write("\n".join(row_strings[start : start + rows]))
+            buffer.write("\n\n")
+        stream.write(buffer.getvalue())
+
+
+class FrameRecorder:
+    """
+    Records the grid after every placement of a solve, emitting only the rows which changed since the
+    previous frame. Frames are buffered and written to the stream every `flush_every` frames, and by
+    `flush`, so the buffer stays small during long games.
+
+    Each frame has the form:
+    ```
+    # step 3
+    8: 0 1 1 0
+    9: 1 1 1 0
+    ```
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        columns: int,
+        stream: TextIO | None = None,
+        flush_every: int = 1000,
+    ):
+        self.renderer = BoardRenderer(columns)
+        self.stream = stream or sys.stdout
+        self.flush_every = flush_every
+        self.previous_grid: ndarray[int] = np.zeros((rows, columns), dtype=int)
+        self.step = 0
+        self.buffer = StringIO()
+
+    def record(self, grid: ndarray[int]):
+        """
+        Buffers the rows of `grid` which are different from the previous recorded frame.
+        """
+        self.step += 1
+        changed_rows: ndarray[int] = np.flatnonzero(
+            (grid != self.previous_grid).any(axis=1)
+        )
+        self.buffer.write(f"# step {self.step}\n")
+        if changed_rows.size:
+            row_strings = self.renderer.render_rows(grid[changed_rows])
+            for row_index, row_string in zip(changed_rows.tolist(), row_strings):
+                self.buffer.write(f"{row_index}: {row_string}\n")
+            np.copyto(self.previous_grid, grid)
+        if self.step % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes all the buffered frames to the stream.
+        """
+        if not self.buffer.tell():
+            return
+        self.stream.write(self.buffer.getvalue())
+        self.buffer = StringIO()
+
+    def reset(self):
+        self.previous_grid.fill(0)
+        self.step = 0
@@ -0,0 +1,44 @@
+import re
+from typing import List
+
+# NOTE: This module must not import numpy, so the persistent cache can normalize sequences
+# without importing the engine.
+
+POLYOMINOE_PATTERN = re.compile(r"([A-Za-z])(\d+)")
+
+
+def extract_polyominoe_data(input: str) -> tuple[str, int]:
+    """
+    Extracts the the polyominoe data from an entry in the input line.
+    Note: The method assumes that all inputs will always have a single alphabeitcal letter
+    and a single integer.
+
+    Returns
+    -------
+    A tuple containing:
+        - `polyominoe:str`: The letter of the polyominoe
+        - `column_index:int`: The index of the column of where the polyominoe should be placed.
+    """
+    match = POLYOMINOE_PATTERN.match(input)
+    return match.group(1), int(match.group(2))
+
+
+def parse_sequence(input: str) -> List[tuple[str, int]]:
+    """
+    Parses an input string like 'Q0,Q1' into its `(polyominoe, column_index)` moves.
+    """
+    return [extract_polyominoe_data(line) for line in input.split(",")]
+
+
+def format_moves(moves: List[tuple[str, int]]) -> str:
+    """
+    Formats parsed moves back to an input string like 'Q0,Q1'
+    """
+    return ",".join(f"{polyominoe}{column_index}" for polyominoe, column_index in moves)
+
+
+def sequence_key(moves: List[tuple[str, int]], rows: int, columns: int) -> str:
+    """
+    Builds the cache key of a parsed sequence for the given grid dimensions. For example `10x10:Q0,Q1`
+    """
+    return f"{rows}x{columns}:{format_moves(moves)}"
@@ -0,0 +1,253 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List
+
+import numpy as np
+from numpy import ndarray
+
+from factory import PIECE_WIDTHS, PIECES
+from tetris_solver import ENGINE_ERRORS, TetrisSolver, TopOutError
+
+ColumnPolicy = Callable[[ndarray[int], int, np.random.Generator], ndarray[int]]
+
+
+def random_column_policy(
+    pieces: ndarray[int], columns: int, rng: np.random.Generator
+) -> ndarray[int]:
+    """
+    Places every polyominoe at a uniformly distributed column where it fits in the grid.
+
+    Raises
+    ------
+    `ValueError` if a polyominoe is wider than the grid
+    """
+    widths: ndarray[int] = PIECE_WIDTHS[pieces]
+    if widths.size and widths.max() > columns:
+        piece = int(pieces.flat[np.argmax(widths)])
+        raise ValueError(
+            f"The {PIECES[piece]} polyominoe is {PIECE_WIDTHS[piece]} columns wide "
+            f"and does not fit in a grid of {columns} columns"
+        )
+    return rng.integers(0, columns - widths + 1)
+
+
+def leftmost_column_policy(
+    pieces: ndarray[int], columns: int, rng: np.random.Generator
+) -> ndarray[int]:
+    """
+    Places every polyominoe at the left-most column of the grid.
+    """
+    return np.zeros_like(pieces)
+
+
+COLUMN_POLICIES: dict[str, ColumnPolicy] = {
+    "random": random_column_policy,
+    "leftmost": leftmost_column_policy,
+}
+
+
+@dataclass
+class SimulationResult:
+    """
+    Distribution of the final heights of a set of simulated games.
+
+    - `histogram:ndarray[int]` - The total of games for each final height, indexed by height
+    - `overflowed_games:int` - The total of games which topped out: a polyominoe did not fit below
+    the top of the grid. Those games are not part of the histogram
+    - `crashed_games:int` - The total of games the engine could not compute, for example a Z
+    polyominoe on an empty grid. Those games are not part of the histogram either
+    """
+
+    histogram: ndarray[int]
+    overflowed_games: int = 0
+    crashed_games: int = 0
+
+    @property
+    def games(self) -> int:
+        return int(self.histogram.sum()) + self.overflowed_games + self.crashed_games
+
+    def percentile(self, percent: float) -> int:
+        """
+        Computes the smallest height which is greater or equal than `percent` % of the completed games.
+
+        Args
+        ----
+        - `percent:float` - A value between 0 and 100
+        """
+        cumulative_games: ndarray[int] = np.cumsum(self.histogram)
+        if cumulative_games[-1] == 0:
+            raise ValueError(
+                "There are no completed games to compute percentiles from"
+            )
+        target = cumulative_games[-1] * percent / 100
+        # the 0th percentile is the smallest height of a completed game, not a height without games
+        side = "right" if target == 0 else "left"
+        return int(np.searchsorted(cumulative_games, target, side=side))
+
+    def percentiles(self, percents=(50, 90, 99)) -> dict[float, int]:
+        return {percent: self.percentile(percent) for percent in percents}
+
+    def merge(self, other: "SimulationResult") -> "SimulationResult":
+        return SimulationResult(
+            self.histogram + other.histogram,
+            self.overflowed_games + other.overflowed_games,
+            self.crashed_games + other.crashed_games,
+        )
+
+
+def generate_pieces(
+    rng: np.random.Generator,
+    games: int,
+    sequence_length: int,
+    distribution: str = "uniform",
+    weights: dict[str, float] | None = None,
+) -> ndarray[int]:
+    """
+    Generates the piece ids of many sequences at once.
+
+    Args
+    ----
+    - `rng:Generator` - The seeded random generator
+    - `games:int` - The total of sequences
+    - `sequence_length:int` - The total of polyominoes in each sequence
+    - `distribution:str` - One of:
+        - `uniform`: every polyominoe is equally likely
+        - `bag`: sequences are made of shuffled bags which contain every polyominoe once (7-bag)
+        - `weighted`: polyominoes are drawn with the given `weights`
+    - `weights:dict[str, float]` - The relative frequency of each polyominoe letter. Missing letters are never drawn
+
+    Returns
+    -------
+    An array with shape `(games, sequence_length)` of indices into `PIECES`
+    """
+    size = (games, sequence_length)
+    if distribution == "uniform":
+        return rng.integers(0, len(PIECES), size=size)
+
+    if distribution == "bag":
+        bags = -(-sequence_length // len(PIECES))
+        pieces = np.broadcast_to(
+            np.arange(len(PIECES)), (games, bags, len(PIECES))
+        )
+        pieces = rng.permuted(pieces, axis=2)
+        return pieces.reshape(games, -1)[:, :sequence_length]
+
+    if distribution == "weighted":
+        if not weights:
+            raise ValueError("The weighted distribution requires weights")
+        probabilities = np.array(
+            [weights.get(piece, 0) for piece in PIECES], dtype=float
+        )
+        return rng.choice(
+            len(PIECES), size=size, p=probabilities / probabilities.sum()
+        )
+
+    raise ValueError(f"{distribution} is not a supported piece distribution")
+
+
+def _simulate_chunk(
+    seed: np.random.SeedSequence,
+    games: int,
+    sequence_length: int,
+    distribution: str,
+    weights: dict[str, float] | None,
+    column_policy: ColumnPolicy,
+    rows: int,
+    columns: int,
+) -> SimulationResult:
+    """
+    Simulates a chunk of games with a single reused solver.
+    """
+    rng = np.random.default_rng(seed)
+    pieces = generate_pieces(rng, games, sequence_length, distribution, weights)
+    placements = column_policy(pieces, columns, rng)
+    letters: ndarray[str] = np.array(PIECES)[pieces]
+
+    tetris_solver = TetrisSolver(rows, columns, detect_top_out=True)
+    histogram: ndarray[int] = np.zeros(rows + 1, dtype=int)
+    overflowed_games = 0
+    crashed_games = 0
+    for game_letters, game_columns in zip(letters.tolist(), placements.tolist()):
+        try:
+            height = tetris_solver.solve_moves(zip(game_letters, game_columns))
+            histogram[height] += 1
+        except TopOutError:
+            overflowed_games += 1
+        except ENGINE_ERRORS:
+            crashed_games += 1
+        tetris_solver.reset()
+
+    return SimulationResult(histogram, overflowed_games, crashed_games)
+
+
+def simulate(
+    sequence_length: int,
+    games: int,
+    distribution: str = "uniform",
+    weights: dict[str, float] | None = None,
+    column_policy: str | ColumnPolicy = "random",
+    rows: int = 10,
+    columns: int = 10,
+    seed: int | None = None,
+    processes: int = 1,
+    chunk_size: int = 1000,
+) -> SimulationResult:
+    """
+    Runs a Monte Carlo simulation of the final height of randomly generated sequences.
+
+    Games are simulated in chunks of `chunk_size`, each with its own random stream derived from
+    `seed`, so the result for a given seed is the same regardless of the total of `processes`.
+
+    Args
+    ----
+    - `sequence_length:int` - The total of polyominoes in each game
+    - `games:int` - The total of games to simulate
+    - `distribution:str` - The piece distribution. See `generate_pieces`
+    - `weights:dict[str, float]` - The piece weights of the `weighted` distribution
+    - `column_policy:str | ColumnPolicy` - A key of `COLUMN_POLICIES` or a callable which maps the piece
+    ids of a chunk to the columns they are placed at. It must be picklable when `processes > 1`
+    - `rows:int`, `columns:int` - The grid dimensions
+    - `seed:int` - The seed of the random generator
+    - `processes:int` - The total of worker processes the chunks are fanned out to
+
+    Returns
+    -------
+    A `SimulationResult` with the merged height histogram of all the games
+    """
+    if isinstance(column_policy, str):
+        if column_policy not in COLUMN_POLICIES:
+            raise ValueError(f"{column_policy} is not a supported column policy")
+        column_policy = COLUMN_POLICIES[column_policy]
+
+    chunk_games: List[int] = [
+        min(chunk_size, games - start) for start in range(0, games, chunk_size)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_games))
+    arguments = [
+        (
+            chunk_seed,
+            total_games,
+            sequence_length,
+            distribution,
+            weights,
+            column_policy,
+            rows,
+            columns,
+        )
+        for chunk_seed, total_games in zip(seeds, chunk_games)
+    ]
+
+    result = SimulationResult(np.zeros(rows + 1, dtype=int))
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(_simulate_chunk, *chunk_arguments)
+                for chunk_arguments in arguments
+            ]
+            for future in futures:
+                result = result.merge(future.result())
+    else:
+        for chunk_arguments in arguments:
+            result = result.merge(_simulate_chunk(*chunk_arguments))
+
+    return result
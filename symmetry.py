@@ -0,0 +1,99 @@
+from typing import List
+
+from factory import POLYOMINOE_WIDTHS
+from sequences import format_moves
+from tetris_solver import TetrisSolver
+
+# The polyominoe each polyominoe turns into when the grid is reflected horizontally
+MIRRORED_POLYOMINOES: dict[str, str] = {
+    "Q": "Q",
+    "I": "I",
+    "T": "T",
+    "S": "Z",
+    "Z": "S",
+    "L": "J",
+    "J": "L",
+}
+
+
+class SymmetryError(Exception):
+    """
+    Raised when a sequence and its mirrored sequence are solved to different results.
+    """
+
+    def __init__(self, moves: List[tuple[str, int]], height, mirrored_height):
+        self.moves = moves
+        self.height = height
+        self.mirrored_height = mirrored_height
+        super().__init__(
+            f"{format_moves(moves)} solves to {height} "
+            f"but its mirror solves to {mirrored_height}"
+        )
+
+
+def mirror_moves(
+    moves: List[tuple[str, int]], columns: int
+) -> List[tuple[str, int]]:
+    """
+    Reflects a sequence horizontally: every polyominoe is swapped for its mirror image and the
+    left-most column `c` it occupies becomes `columns - c - width`.
+
+    Args
+    ----
+    - `moves:List[tuple[str, int]]` - The `(polyominoe, column_index)` moves
+    - `columns:int` - The total of columns of the grid
+    """
+    return [
+        (
+            MIRRORED_POLYOMINOES[polyominoe],
+            columns - column_index - POLYOMINOE_WIDTHS[polyominoe],
+        )
+        for polyominoe, column_index in moves
+    ]
+
+
+def canonicalize(
+    moves: List[tuple[str, int]], columns: int
+) -> tuple[List[tuple[str, int]], bool]:
+    """
+    Maps a sequence and its mirrored sequence to the same canonical form, the smallest of the two.
+
+    Returns
+    -------
+    A tuple containing:
+        - The canonical moves
+        - `True` if the canonical moves are the mirror of `moves`, otherwise `False`
+    """
+    mirrored_moves = mirror_moves(moves, columns)
+    if mirrored_moves < moves:
+        return mirrored_moves, True
+    return moves, False
+
+
+def verify_symmetry(
+    moves: List[tuple[str, int]], rows: int = 10, columns: int = 10
+) -> int:
+    """
+    Solves a sequence and its mirrored sequence, confirming that both have the same height.
+
+    Returns
+    -------
+    The height of the sequence
+
+    Raises
+    ------
+    `SymmetryError` if the heights are different, or only one of the two solves fails
+    """
+    results = []
+    for sequence_moves in (moves, mirror_moves(moves, columns)):
+        try:
+            results.append(TetrisSolver(rows, columns).solve_moves(sequence_moves))
+        except Exception as error:
+            results.append(error)
+
+    height, mirrored_height = results
+    if isinstance(height, Exception) and isinstance(mirrored_height, Exception):
+        raise height
+    if isinstance(height, Exception) or height != mirrored_height:
+        raise SymmetryError(moves, height, mirrored_height)
+    return height
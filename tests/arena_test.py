@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from arena import RESULT_ENGINE_ERROR, RESULT_OVERFLOW, ArenaSpec, BoardArena
+from tetris_solver import ENGINE_ERRORS, TetrisSolver, TopOutError
+import pytest
+
+SEQUENCES = [
+    "Q0",
+    "Q0,Q2,Q4,Q6,Q8",
+    "I0,I4,Q8",
+    "Z1",
+    "L0,J3,L5,J8,T1,T6,J2,L6,T0,T7",
+    "S0,S2,S4,S6",
+    "T1,Z3,I4",
+    ",".join(["I0"] * 11),
+]
+
+
+def assert_solved(arena: BoardArena):
+    for board_index, sequence in enumerate(SEQUENCES):
+        tetris_solver = TetrisSolver(detect_top_out=True)
+        try:
+            height = tetris_solver.solve(sequence)
+        except TopOutError:
+            assert arena.results[board_index] == RESULT_OVERFLOW
+            continue
+        except ENGINE_ERRORS:
+            assert arena.results[board_index] == RESULT_ENGINE_ERROR
+            continue
+        assert arena.results[board_index] == height
+        assert np.array_equal(arena.grids[board_index], tetris_solver.grid)
+
+
+@pytest.mark.parametrize("processes", [1, 3])
+def test_solve_in_place(processes: int):
+    with BoardArena(len(SEQUENCES)) as arena:
+        arena.solve(SEQUENCES, processes=processes)
+
+        assert arena.grids.dtype == np.uint8
+        assert arena.results[SEQUENCES.index("Z1")] == RESULT_ENGINE_ERROR
+        assert arena.results[-1] == RESULT_OVERFLOW
+        assert_solved(arena)
+
+
+def crash(spec: ArenaSpec):
+    BoardArena.attach(spec)
+    os._exit(1)
+
+
+def test_shared_memory_is_unlinked_after_worker_crash():
+    with pytest.raises(BrokenProcessPool):
+        with BoardArena(len(SEQUENCES)) as arena:
+            spec = arena.spec
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                executor.submit(crash, spec).result()
+
+    for name in (spec.grids_name, spec.results_name):
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
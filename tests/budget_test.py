@@ -0,0 +1,119 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import random
+from budget import (
+    CANCELLED,
+    EXHAUSTED_MOVES,
+    EXHAUSTED_TIME,
+    SolveBudget,
+    SolveTimeout,
+)
+from tetris_solver import TetrisSolver, solve, solve_async
+import pytest
+
+# 5 moves which clear the bottom row every time they repeat
+PERIODIC_SEQUENCE = "Q0,Q2,Q4,Q6,Q8"
+
+
+def test_move_budget_returns_partial_result():
+    tetris_solver = TetrisSolver()
+    with pytest.raises(SolveTimeout) as timeout:
+        tetris_solver.solve("Q0,Q2,Q4,I0,I4,Q8", budget=SolveBudget(max_moves=4))
+
+    progress = timeout.value.progress
+    assert progress.moves == 4
+    assert progress.reason == EXHAUSTED_MOVES
+    assert progress.height == TetrisSolver().solve("Q0,Q2,Q4,I0")
+    assert progress.height == 3
+
+
+def test_budget_large_enough_for_the_sequence():
+    budget = SolveBudget(max_moves=6, max_seconds=60)
+
+    assert TetrisSolver().solve("Q0,Q2,Q4,I0,I4,Q8", budget=budget) == 3
+    assert budget.moves == 6
+    assert budget.exhausted_reason is None
+
+
+def test_time_budget():
+    with pytest.raises(SolveTimeout) as timeout:
+        solve(PERIODIC_SEQUENCE, budget=SolveBudget(max_seconds=0))
+
+    assert timeout.value.progress.moves == 0
+    assert timeout.value.progress.height == 0
+    assert timeout.value.progress.reason == EXHAUSTED_TIME
+
+
+def test_cancelled_budget():
+    budget = SolveBudget()
+    budget.cancel()
+
+    with pytest.raises(SolveTimeout) as timeout:
+        TetrisSolver().solve(PERIODIC_SEQUENCE, budget=budget)
+    assert timeout.value.progress.reason == CANCELLED
+
+
+def test_solve_async():
+    assert asyncio.run(solve_async("Q0,Q2,I4")) == 2
+
+
+def test_cancelling_async_solve_stops_the_worker_thread():
+    total_moves = 200_000
+    # shuffled groups still clear the rows they fill, but are not periodic so they are not fast-forwarded
+    rng = random.Random(0)
+    groups = [PERIODIC_SEQUENCE.split(",") for _ in range(total_moves // 5)]
+    for group in groups:
+        rng.shuffle(group)
+    sequence = ",".join(move for group in groups for move in group)
+    budget = SolveBudget()
+
+    async def cancel_in_flight():
+        task = asyncio.create_task(solve_async(sequence, budget=budget))
+        while budget.moves == 0:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_in_flight())
+
+    assert budget.exhausted_reason == CANCELLED
+    assert 0 < budget.moves < total_moves
+
+
+def test_budgeted_periodic_solve_is_fast_forwarded(monkeypatch):
+    total_moves = 2_000
+    sequence = ",".join([PERIODIC_SEQUENCE] * (total_moves // 5))
+    placements = []
+    place = TetrisSolver._TetrisSolver__place
+
+    def counting_place(self, polyominoe, column_index):
+        placements.append(polyominoe)
+        return place(self, polyominoe, column_index)
+
+    monkeypatch.setattr(TetrisSolver, "_TetrisSolver__place", counting_place)
+    budget = SolveBudget(max_seconds=60)
+
+    assert TetrisSolver().solve(sequence, budget=budget) == 0
+    assert budget.moves == total_moves
+    assert budget.exhausted_reason is None
+    assert len(placements) < 200
+
+
+def test_move_budget_of_a_fast_forwarded_solve():
+    sequence = ",".join([PERIODIC_SEQUENCE] * 400 + ["Q0", "I4"])
+
+    for max_moves in [1, 7, 1_000, 2_000, 2_001]:
+        with pytest.raises(SolveTimeout) as timeout:
+            TetrisSolver().solve(sequence, budget=SolveBudget(max_moves=max_moves))
+
+        progress = timeout.value.progress
+        prefix = ",".join(sequence.split(",")[:max_moves])
+        assert progress.moves == max_moves
+        assert progress.reason == EXHAUSTED_MOVES
+        assert progress.height == TetrisSolver(fast_forward=False).solve(prefix)
@@ -4,7 +4,13 @@ import os
 # Add the path to the root directory to sys.path so we can import the from our modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from factory import PolyominoeFactory
+from factory import (
+    PIECE_IDS,
+    PIECE_WIDTHS,
+    PIECES,
+    POLYOMINOE_WIDTHS,
+    PolyominoeFactory,
+)
 from models import (
     QPolyminoe,
     JPolyminoe,
@@ -63,3 +69,25 @@ def test_create_unknown_polyominoe(polyominoe_factory: PolyominoeFactory):
         Exception, match=f"{polyominoe_type} is not implemented in the factory yet!"
     ):
         polyominoe_factory.create(polyominoe_type)
+
+
+def test_create_reuses_released_polyominoe(polyominoe_factory: PolyominoeFactory):
+    polyominoe = polyominoe_factory.create("Q")
+    polyominoe.removed_row_index = 3
+    polyominoe_factory.release(polyominoe)
+
+    result = polyominoe_factory.create("Q")
+    assert result is polyominoe
+    assert result.body == []
+    assert result.removed_row_index is None
+    assert polyominoe_factory.create("Q") is not polyominoe
+
+
+def test_piece_tables():
+    # piece ids are persisted in keyframes, so their order must not change
+    assert PIECES == ["Q", "I", "Z", "T", "S", "L", "J"]
+    assert POLYOMINOE_WIDTHS == {"Q": 2, "I": 4, "Z": 3, "T": 3, "S": 3, "L": 2, "J": 2}
+    for piece_id, piece in enumerate(PIECES):
+        polyomino_class = type(PolyominoeFactory().create(piece))
+        assert PIECE_IDS[polyomino_class] == piece_id
+        assert PIECE_WIDTHS[piece_id] == POLYOMINOE_WIDTHS[piece]
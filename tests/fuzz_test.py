@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from fuzz import (
+    BACKENDS,
+    fuzz,
+    generate_sequences,
+    minimize,
+    reference_backend,
+)
+from sequences import parse_sequence
+from factory import PIECE_WIDTHS, PIECES
+
+
+def drops_i_pieces_backend(moves, rows, columns):
+    return reference_backend(
+        [(polyominoe, column) for polyominoe, column in moves if polyominoe != "I"],
+        rows,
+        columns,
+    )
+
+
+def test_generated_sequences_fit_in_the_grid():
+    sequences = generate_sequences(np.random.default_rng(0), 200, 12, 10)
+
+    assert len(sequences) == 200
+    for moves in sequences:
+        assert 1 <= len(moves) <= 12
+        for polyominoe, column_index in moves:
+            width = PIECE_WIDTHS[PIECES.index(polyominoe)]
+            assert 0 <= column_index <= 10 - width
+
+
+def test_minimize_to_shortest_reproducing_sequence():
+    moves = parse_sequence("Q0,Q2,T4,I6,Q0,L3")
+
+    minimized = minimize(moves, lambda candidate: ("I", 6) in candidate)
+
+    assert minimized == [("I", 6)]
+
+
+def test_backends_match_the_reference():
+    report = fuzz(300, seed=0, processes=2, chunk_size=100)
+
+    assert report.sequences == 300
+    assert report.mismatched_sequences == 0
+    assert report.sequences_per_second > 0
+
+
+def test_engine_errors_match_the_reference():
+    # the reference raises an AttributeError, the optimized engine a WrappedPolyominoeError
+    moves = parse_sequence("I6,I0,S6,S4")
+
+    assert reference_backend(moves, 10, 10) == ("AttributeError", None)
+    for backend in BACKENDS.values():
+        assert backend(moves, 10, 10) == ("AttributeError", None)
+
+
+def test_broken_backend_mismatches_are_minimized():
+    report = fuzz(
+        200, {"drops_i_pieces": drops_i_pieces_backend}, seed=0, chunk_size=50
+    )
+
+    assert report.mismatched_sequences > 0
+    assert report.mismatches
+    for mismatch in report.mismatches:
+        minimized = parse_sequence(mismatch.minimized)
+        assert len(minimized) == 1
+        assert minimized[0][0] == "I"
+        assert mismatch.outcomes["reference"] != mismatch.outcomes["drops_i_pieces"]
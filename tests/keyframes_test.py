@@ -0,0 +1,55 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from keyframes import KeyframeIndex, keyframes_path
+from sequences import parse_sequence
+from tetris_solver import TetrisSolver
+import pytest
+
+# Clears rows, splits polyominoes and shifts them down without topping out the grid
+MOVES = parse_sequence(
+    "I6,Q0,Q2,Q4,Q6,Q8,J5,T0,Q0,Q2,Q4,Q6,Q8,Q0,Q2,Q4,Q6,Q8,"
+    "I5,T3,Q0,Q2,Q4,Q6,Q8,J1,I0,L2,J8,L5"
+)
+
+
+@pytest.mark.parametrize("spacing", [1, 4, 100])
+def test_seek_matches_solving_the_prefix(spacing: int):
+    index = KeyframeIndex.build(MOVES, spacing)
+
+    for move in range(len(MOVES) + 1):
+        tetris_solver = TetrisSolver()
+        height = tetris_solver.solve_moves(MOVES[:move])
+
+        assert index.seek(move) == height
+        assert np.array_equal(index.tetris_solver.grid, tetris_solver.grid)
+        # the restored state also determines the following placements
+        assert index.tetris_solver.solve_moves(MOVES[move:]) == tetris_solver.solve_moves(
+            MOVES[move:]
+        )
+
+
+def test_seek_out_of_range():
+    index = KeyframeIndex.build(MOVES, 4)
+
+    with pytest.raises(ValueError):
+        index.seek(len(MOVES) + 1)
+
+
+def test_save_and_load(tmp_path):
+    path = keyframes_path(str(tmp_path / "game.txt"))
+    index = KeyframeIndex.build(MOVES, 3)
+    index.save(path)
+
+    loaded_index = KeyframeIndex.load(path, MOVES)
+    assert loaded_index.spacing == 3
+    for move in range(len(MOVES) + 1):
+        assert loaded_index.seek(move) == index.seek(move)
+        assert np.array_equal(loaded_index.tetris_solver.grid, index.tetris_solver.grid)
+
+    with pytest.raises(ValueError):
+        KeyframeIndex.load(path, MOVES[:-1])
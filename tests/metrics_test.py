@@ -0,0 +1,114 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from metrics import IncrementalFeatures, compute_features
+from sequences import parse_sequence
+from tetris_solver import TetrisSolver
+import pytest
+
+
+def reference_features(grid) -> dict:
+    """
+    Computes the features with plain python loops
+    """
+    rows, columns = grid.shape
+    heights = []
+    holes = 0
+    for column_index in range(columns):
+        height = 0
+        for row_index in range(rows):
+            if grid[row_index, column_index]:
+                height = rows - row_index
+                break
+        heights.append(height)
+        for row_index in range(rows - height, rows):
+            holes += grid[row_index, column_index] == 0
+
+    row_transitions = 0
+    for row_index in range(rows):
+        cells = [1] + list(grid[row_index]) + [1]
+        row_transitions += sum(a != b for a, b in zip(cells, cells[1:]))
+
+    well_depths = []
+    for column_index in range(columns):
+        neighbors = []
+        if column_index > 0:
+            neighbors.append(heights[column_index - 1])
+        if column_index < columns - 1:
+            neighbors.append(heights[column_index + 1])
+        depth = min(neighbors) - heights[column_index] if neighbors else 0
+        well_depths.append(max(depth, 0))
+
+    return {
+        "column_heights": heights,
+        "aggregate_height": sum(heights),
+        "bumpiness": sum(abs(a - b) for a, b in zip(heights, heights[1:])),
+        "holes": holes,
+        "row_transitions": row_transitions,
+        "well_depths": well_depths,
+    }
+
+
+def assert_features(features, expected: dict):
+    for name, value in expected.items():
+        assert np.array_equal(getattr(features, name), value), name
+
+
+@pytest.mark.parametrize("columns", [1, 2, 10])
+def test_features_of_single_grids(columns: int):
+    rng = np.random.default_rng(columns)
+    for _ in range(20):
+        grid = (rng.random((8, columns)) < rng.random()).astype(int)
+        assert_features(compute_features(grid), reference_features(grid))
+
+
+def test_features_of_stacked_grids():
+    grids = np.random.default_rng(0).integers(0, 2, size=(5, 10, 10))
+    features = compute_features(grids)
+
+    assert features.holes.shape == (5,)
+    assert features.well_depths.shape == (5, 10)
+    for index, grid in enumerate(grids):
+        expected = reference_features(grid)
+        for name, value in expected.items():
+            assert np.array_equal(getattr(features, name)[index], value), name
+
+
+def test_incremental_features_match_full_computation():
+    rng = np.random.default_rng(0)
+    grid = np.zeros((10, 10), dtype=int)
+    incremental_features = IncrementalFeatures(grid)
+
+    for _ in range(200):
+        changed_cells = [tuple(cell) for cell in rng.integers(0, 10, size=(4, 2))]
+        for row_index, column_index in changed_cells:
+            grid[row_index, column_index] ^= 1
+        incremental_features.update(grid, changed_cells)
+
+        assert_features(incremental_features.features, reference_features(grid))
+
+
+@pytest.mark.parametrize(
+    "sequence",
+    [
+        "I6,Q0,Q2,Q4,Q6,Q8,J5,T0,Q0,Q2,Q4,Q6,Q8,Q0,Q2,Q4,Q6,Q8,"
+        "I5,T3,Q0,Q2,Q4,Q6,Q8,J1,I0,L2,J8,L5",
+        ",".join(["L0,J3,L5,J8,T1,T6,S2,Z5,T0,T7"] * 3),
+    ],
+)
+def test_incremental_features_follow_a_solve(sequence: str):
+    tetris_solver = TetrisSolver(record_changes=True)
+    incremental_features = IncrementalFeatures(tetris_solver.grid)
+
+    for move in parse_sequence(sequence):
+        tetris_solver.solve_moves([move])
+        incremental_features.update(tetris_solver.grid, tetris_solver.changed_cells)
+
+        assert_features(
+            incremental_features.features,
+            reference_features(tetris_solver.grid),
+        )
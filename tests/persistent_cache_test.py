@@ -0,0 +1,129 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from concurrent.futures import ProcessPoolExecutor
+import sqlite3
+import subprocess
+from persistent_cache import PersistentCache
+import pytest
+
+
+@pytest.fixture
+def cache_path(tmp_path) -> str:
+    return str(tmp_path / "heights.sqlite")
+
+
+def test_get_and_set(cache_path: str):
+    with PersistentCache(cache_path) as cache:
+        assert cache.get("10x10:Q0") is None
+        cache.set("10x10:Q0", 2)
+
+    with PersistentCache(cache_path) as cache:
+        assert cache.get("10x10:Q0") == 2
+        assert len(cache) == 1
+
+
+def test_version_change_discards_entries(cache_path: str):
+    with PersistentCache(cache_path, version=1) as cache:
+        cache.set("10x10:Q0", 2)
+
+    with PersistentCache(cache_path, version=2) as cache:
+        assert cache.get("10x10:Q0") is None
+
+
+def test_oldest_entries_are_evicted(cache_path: str):
+    with PersistentCache(cache_path, max_entries=3) as cache:
+        for column_index in range(5):
+            cache.set(f"10x10:Q{column_index}", 2)
+
+        assert len(cache) == 3
+        assert cache.get("10x10:Q1") is None
+        assert cache.get("10x10:Q4") == 2
+
+
+def test_rewriting_a_key_does_not_evict_other_entries(cache_path: str):
+    with PersistentCache(cache_path, max_entries=3) as cache:
+        for key in ("10x10:Q0", "10x10:Q2", "10x10:Q4"):
+            cache.set(key, 2)
+        for _ in range(3):
+            cache.set("10x10:Q0", 2)
+
+        assert len(cache) == 3
+        assert cache.get("10x10:Q2") == 2
+
+        # the rewritten key is the most recently written one
+        cache.set("10x10:Q6", 2)
+        assert cache.get("10x10:Q2") is None
+        assert cache.get("10x10:Q0") == 2
+
+
+def test_opening_an_up_to_date_cache_does_not_wait_for_writers(cache_path: str):
+    with PersistentCache(cache_path) as cache:
+        cache.set("10x10:Q0", 2)
+
+    writer = sqlite3.connect(cache_path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        with PersistentCache(cache_path, timeout=0) as cache:
+            assert cache.get("10x10:Q0") == 2
+            assert len(cache) == 1
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def write_entries(cache_path: str, worker: int) -> int:
+    with PersistentCache(cache_path) as cache:
+        for column_index in range(50):
+            cache.set(f"10x10:Q{column_index},I{worker}", worker)
+    return worker
+
+
+def test_concurrent_processes(cache_path: str):
+    PersistentCache(cache_path).close()
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(write_entries, [cache_path] * 8, range(8)))
+
+    with PersistentCache(cache_path) as cache:
+        assert len(cache) == 50 * 8
+        assert cache.get("10x10:Q3,I7") == 7
+
+
+def test_cli_cache_hit_does_not_import_numpy(cache_path: str):
+    # runs the CLI and reports whether numpy got imported
+    script = (
+        "import runpy, sys\n"
+        f"sys.argv = ['tetris.py', 'Q0,Q1', '--cache', {cache_path!r}]\n"
+        "try:\n"
+        "    runpy.run_path('tetris.py', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('numpy' in sys.modules)"
+    )
+
+    outputs = [
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True
+        ).stdout.split()
+        for _ in range(2)
+    ]
+
+    assert outputs == [["4", "True"], ["4", "False"]]
+
+
+def test_cli_budget_is_not_answered_from_the_cache(cache_path: str):
+    command = [sys.executable, "tetris.py", "Q0,Q2,Q4,I0", "--cache", cache_path]
+    assert subprocess.run(command, cwd=ROOT, capture_output=True, text=True).stdout == "3\n"
+
+    budgeted = subprocess.run(
+        command + ["--max-moves", "1"], cwd=ROOT, capture_output=True, text=True
+    )
+
+    assert budgeted.returncode == 1
+    assert budgeted.stdout == ""
+    assert "after 1 moves at height 2" in budgeted.stderr
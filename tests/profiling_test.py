@@ -0,0 +1,78 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tracemalloc
+from profiling import MemoryBudgetExceeded, MemoryProfiler, SUBSYSTEMS
+from tetris_solver import TetrisSolver
+import pytest
+
+
+def test_profiler_samples_every_n_moves():
+    sequence = ",".join(["Q0,Q2,Q4,Q6,Q8,I0,I4,Q8,I0,I4"] * 10)
+
+    with MemoryProfiler(sample_every=5) as memory_profiler:
+        tetris_solver = TetrisSolver(memory_profiler=memory_profiler)
+        assert tetris_solver.solve(sequence) == 0
+
+    assert not tracemalloc.is_tracing()
+    sample_moves = [sample.move for sample in memory_profiler.samples]
+    assert sample_moves == list(range(5, 101, 5))
+    for sample in memory_profiler.samples:
+        assert sample.subsystem_bytes["grid"] == tetris_solver.grid.nbytes
+        polyominoes = sample.live_polyominoes + sample.pooled_polyominoes
+        assert sample.cells == 4 * polyominoes
+
+    report = memory_profiler.report()
+    assert set(report.keys()) == set(SUBSYSTEMS)
+    for subsystem_report in report.values():
+        assert subsystem_report.peak >= subsystem_report.steady_state
+
+
+def test_profiler_fails_runs_over_budget():
+    sequence = ",".join(["Q0,Q2,Q4,Q6,Q8"] * 10)
+
+    with MemoryProfiler(sample_every=5, budget_bytes=1) as memory_profiler:
+        tetris_solver = TetrisSolver(memory_profiler=memory_profiler)
+        with pytest.raises(MemoryBudgetExceeded) as error:
+            tetris_solver.solve(sequence)
+
+    assert error.value.move == 5
+
+
+def test_runs_shorter_than_one_sample_are_sampled_and_checked():
+    with MemoryProfiler(sample_every=1000) as memory_profiler:
+        TetrisSolver(memory_profiler=memory_profiler).solve("Q0,Q2,Q4")
+    assert [sample.move for sample in memory_profiler.samples] == [3]
+    assert memory_profiler.report()
+
+    with MemoryProfiler(sample_every=1000, budget_bytes=1) as memory_profiler:
+        with pytest.raises(MemoryBudgetExceeded) as error:
+            TetrisSolver(memory_profiler=memory_profiler).solve("Q0,Q2,Q4")
+    assert error.value.move == 3
+
+
+def test_peak_between_samples_is_checked_against_the_budget():
+    with MemoryProfiler(sample_every=1000, budget_bytes=1_000_000) as memory_profiler:
+        # freed again before the only sample is taken
+        allocation = bytearray(5_000_000)
+        del allocation
+        with pytest.raises(MemoryBudgetExceeded) as error:
+            TetrisSolver(memory_profiler=memory_profiler).solve("Q0")
+
+    assert error.value.traced_bytes >= 5_000_000
+
+
+def test_profiler_starts_tracing_at_the_first_move():
+    memory_profiler = MemoryProfiler(sample_every=1000, budget_bytes=1)
+    try:
+        with pytest.raises(MemoryBudgetExceeded):
+            TetrisSolver(memory_profiler=memory_profiler).solve("Q0,Q2,Q4")
+        assert tracemalloc.is_tracing()
+    finally:
+        memory_profiler.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert memory_profiler.peak_traced_bytes > 1
@@ -0,0 +1,81 @@
+import sys
+import os
+from io import StringIO
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from rendering import BoardRenderer, FrameRecorder
+from tetris_solver import TetrisSolver, TopOutError
+import pytest
+
+
+def savetxt(grid) -> str:
+    stream = StringIO()
+    np.savetxt(stream, grid, fmt="%d", delimiter=" ")
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("columns", [1, 4, 8, 10, 13, 16, 21])
+def test_render_matches_savetxt(columns: int):
+    grid = np.random.default_rng(columns).integers(0, 2, size=(6, columns))
+
+    assert BoardRenderer(columns).render(grid) == savetxt(grid)
+
+
+def test_write_many_boards():
+    grids = np.random.default_rng(0).integers(0, 2, size=(3, 4, 10))
+    stream = StringIO()
+
+    BoardRenderer(10).write(grids, stream)
+
+    assert stream.getvalue() == "".join(savetxt(grid) + "\n" for grid in grids)
+
+
+def test_frames_only_contain_changed_rows():
+    stream = StringIO()
+    recorder = FrameRecorder(4, 4, stream)
+    grid = np.zeros((4, 4), dtype=int)
+
+    grid[3, :2] = 1
+    recorder.record(grid)
+    recorder.record(grid)
+    grid[2, 1] = 1
+    recorder.record(grid)
+    recorder.flush()
+
+    assert stream.getvalue() == (
+        "# step 1\n3: 1 1 0 0\n# step 2\n# step 3\n2: 0 1 0 0\n"
+    )
+
+
+def test_frames_are_flushed_every_n_frames():
+    stream = StringIO()
+    recorder = FrameRecorder(4, 4, stream, flush_every=2)
+    grid = np.zeros((4, 4), dtype=int)
+
+    recorder.record(grid)
+    assert stream.getvalue() == ""
+    recorder.record(grid)
+    assert stream.getvalue() == "# step 1\n# step 2\n"
+    recorder.record(grid)
+    assert stream.getvalue() == "# step 1\n# step 2\n"
+
+
+def test_frames_are_written_when_a_placement_fails(capsys):
+    tetris_solver = TetrisSolver(frames=True, detect_top_out=True)
+
+    with pytest.raises(TopOutError):
+        tetris_solver.solve(",".join(["I0"] * 11))
+
+    output = capsys.readouterr().out
+    assert "# step 10\n0: 1 1 1 1 0 0 0 0 0 0\n" in output
+    assert "# step 11" not in output
+
+
+def test_solver_verbose_output(capsys):
+    tetris_solver = TetrisSolver(verbose=True)
+    tetris_solver.solve("Q0,I2")
+
+    assert capsys.readouterr().out == savetxt(tetris_solver.grid) + "\n\n"
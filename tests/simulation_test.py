@@ -0,0 +1,79 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from factory import PIECES
+from simulation import SimulationResult, generate_pieces, simulate
+import pytest
+
+
+def test_bag_distribution_contains_every_piece_once_per_bag():
+    rng = np.random.default_rng(0)
+    pieces = generate_pieces(rng, 50, 14, "bag")
+
+    assert pieces.shape == (50, 14)
+    for bag in pieces.reshape(-1, len(PIECES)):
+        assert sorted(bag) == list(range(len(PIECES)))
+
+
+def test_weighted_distribution_only_draws_weighted_pieces():
+    rng = np.random.default_rng(0)
+    pieces = generate_pieces(rng, 20, 10, "weighted", weights={"Q": 1, "I": 3})
+
+    assert set(np.unique(pieces)) == {PIECES.index("Q"), PIECES.index("I")}
+
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError):
+        generate_pieces(np.random.default_rng(0), 1, 1, "Unknown")
+
+
+def test_simulate_single_piece_games():
+    result = simulate(1, 100, weights={"Q": 1}, distribution="weighted", seed=0)
+
+    assert result.games == 100
+    assert result.histogram[2] == 100
+    assert result.percentiles() == {50: 2, 90: 2, 99: 2}
+
+
+def test_simulate_is_deterministic_across_processes():
+    single = simulate(6, 300, distribution="bag", seed=7, chunk_size=100)
+    multi = simulate(
+        6, 300, distribution="bag", seed=7, chunk_size=100, processes=2
+    )
+
+    assert single.games == 300
+    assert np.array_equal(single.histogram, multi.histogram)
+    assert single.overflowed_games == multi.overflowed_games
+    assert single.crashed_games == multi.crashed_games
+
+
+def test_percentile():
+    result = SimulationResult(np.array([0, 5, 0, 5]))
+
+    assert result.percentile(50) == 1
+    assert result.percentile(51) == 3
+    assert result.percentile(100) == 3
+    assert result.percentile(0) == 1
+
+
+def test_random_column_policy_rejects_polyominoes_wider_than_the_grid():
+    with pytest.raises(ValueError, match="I polyominoe is 4 columns wide"):
+        simulate(5, 10, weights={"I": 1}, distribution="weighted", columns=3)
+
+
+def test_top_out_and_engine_errors_are_counted_separately():
+    # a single Z on an empty grid is an engine error, it cannot top out the grid
+    result = simulate(1, 50, weights={"Z": 1}, distribution="weighted", seed=0)
+    assert result.overflowed_games == 0
+    assert result.crashed_games + result.histogram.sum() == 50
+
+    # 11 I polyominoes on the same column top out a 10 row grid
+    result = simulate(
+        11, 20, weights={"I": 1}, distribution="weighted", column_policy="leftmost"
+    )
+    assert result.overflowed_games == 20
+    assert result.histogram.sum() == 0
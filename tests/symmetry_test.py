@@ -0,0 +1,86 @@
+import sys
+import os
+
+# Add the path to the root directory to sys.path so we can import the from our modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from cache import SolveCache
+from tetris_solver import ENGINE_ERRORS, TetrisSolver
+from symmetry import SymmetryError, canonicalize, mirror_moves, verify_symmetry
+import pytest
+
+
+def test_mirror_moves():
+    moves = [("Q", 0), ("S", 2), ("L", 4), ("I", 6), ("T", 1)]
+
+    assert mirror_moves(moves, 10) == [
+        ("Q", 8),
+        ("Z", 5),
+        ("J", 4),
+        ("I", 0),
+        ("T", 6),
+    ]
+    assert mirror_moves(mirror_moves(moves, 10), 10) == moves
+
+
+def test_canonicalize_maps_mirrored_sequences_to_the_same_form():
+    moves = [("L", 0), ("Q", 4)]
+    mirrored_moves = mirror_moves(moves, 10)
+
+    canonical_moves, mirrored = canonicalize(moves, 10)
+    canonical_mirrored_moves, mirrored_mirrored = canonicalize(mirrored_moves, 10)
+
+    assert canonical_moves == canonical_mirrored_moves
+    assert mirrored != mirrored_mirrored
+
+
+def test_verify_symmetry():
+    assert verify_symmetry([("Q", 0), ("Q", 2), ("I", 4)]) == 2
+
+    with pytest.raises(SymmetryError):
+        verify_symmetry([("Z", 1)])
+
+
+def test_symmetric_cache_shares_mirrored_entries():
+    cache = SolveCache(symmetric=True, verify=True)
+
+    assert cache.solve("Q0,Q2,I4") == 2
+    assert cache.solve("Q8,Q6,I2") == 2
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_without_symmetry_keeps_mirrored_entries_apart():
+    cache = SolveCache()
+
+    assert cache.solve("Q0") == 2
+    assert cache.solve("Q0") == 2
+    assert cache.solve("Q8") == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_symmetric_cache_keeps_asymmetric_entries_apart():
+    cache = SolveCache(symmetric=True)
+
+    assert cache.solve("I0,S3") == 3
+    assert cache.solve("I6,Z4") == 2
+    assert cache.solve("I6,Z4") == 2
+    assert cache.solve("I0,S3") == 3
+    # the mirror was solved with the first miss
+    assert cache.misses == 1
+    assert cache.hits == 3
+
+
+def test_symmetric_cache_matches_the_engine():
+    cache = SolveCache(symmetric=True)
+    sequences = ["Z1", "S6", "Q0,Q2,I4", "Q8,Q6,I2", "I0,S3", "I6,Z4", "L0,J3", "L5,J8"]
+
+    for sequence in sequences + sequences:
+        try:
+            height = TetrisSolver().solve(sequence)
+        except ENGINE_ERRORS:
+            with pytest.raises(ENGINE_ERRORS):
+                cache.solve(sequence)
+            continue
+        assert cache.solve(sequence) == height
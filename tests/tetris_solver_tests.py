@@ -4,7 +4,22 @@ import os
 
 # Add the path to the root directory to sys.path so we can import the from our modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from tetris_solver import TetrisSolver
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import random
+import tracemalloc
+import numpy as np
+from models import NO_FILLED_ROWS, RowCounter, WrappedPolyominoeError
+from tetris_solver import (
+    ENGINE_ERRORS,
+    SOLVER_POOLS_PER_THREAD,
+    _thread_local,
+    TetrisSolver,
+    TopOutError,
+    find_periodic_prefix,
+    parse_sequence,
+    solve,
+)
 import pytest
 
 
@@ -64,3 +79,193 @@ def test_solver_2000_by_2000():
 
         assert computed_height == expected_height
         tetris_solver.reset()
+
+
+def test_solver_steady_state_does_not_allocate_polyominoes():
+    tetris_solver = TetrisSolver()
+    sequence = ",".join(["Q0,Q2,Q4,Q6,Q8,I0,I4,Q8,I0,I4"] * 10)
+
+    # warm up the polyominoe pool
+    tetris_solver.solve(sequence)
+    tetris_solver.reset()
+
+    def get_polyominoes() -> dict:
+        pools = tetris_solver.polyominoe_factory.pool.values()
+        polyominoes = [p for pool in pools for p in pool] + tetris_solver.polyominoes
+        # keep references so the ids can not be reused by new objects
+        return {id(polyominoe): polyominoe for polyominoe in polyominoes}
+
+    warm_polyominoes = get_polyominoes()
+    for _ in range(100):
+        assert tetris_solver.solve(sequence) == 0
+        tetris_solver.reset()
+
+    assert get_polyominoes().keys() == warm_polyominoes.keys()
+    for polyominoe in warm_polyominoes.values():
+        cell_ids = {id(cell) for cell in polyominoe._cells}
+        assert all(id(cell) in cell_ids for cell in polyominoe.body)
+
+
+def test_solver_does_not_retain_memory_per_move():
+    # tracemalloc only sees the blocks still alive at a snapshot, so this checks that repeated solves
+    # do not grow the retained memory, not how many short-lived objects every move allocates.
+    # every move is placed, none are fast-forwarded
+    tetris_solver = TetrisSolver(fast_forward=False)
+    sequence = ",".join(["Q0,Q2,Q4,Q6,Q8,I0,I4,Q8,I0,I4"] * 10)
+    runs = 50
+
+    tracemalloc.start()
+    try:
+        # warm up the polyominoe pool
+        tetris_solver.solve(sequence)
+        tetris_solver.reset()
+        warm_snapshot = tracemalloc.take_snapshot()
+
+        for _ in range(runs):
+            tetris_solver.solve(sequence)
+            tetris_solver.reset()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    block_growth = sum(
+        statistic.count_diff
+        for statistic in snapshot.compare_to(warm_snapshot, "filename")
+    )
+    assert block_growth / (runs * 100) < 0.05
+
+
+def test_wrapped_polyominoes_raise_an_engine_error():
+    # the second S wraps around to negative rows, and cannot be shifted down after the line clear
+    with pytest.raises(WrappedPolyominoeError) as error:
+        TetrisSolver().solve("I6,I0,S6,S4")
+
+    assert isinstance(error.value, ENGINE_ERRORS)
+    assert isinstance(error.value, AttributeError)
+    assert not issubclass(AttributeError, ENGINE_ERRORS)
+
+
+def test_moves_which_fill_no_row_do_not_build_a_list():
+    row_counter = RowCounter(10)
+    grid = np.zeros((10, 10), dtype=int)
+    for column_index in range(4):
+        row_counter.occupy(grid, 9, column_index)
+    assert row_counter.pop_filled_rows(10) is NO_FILLED_ROWS
+    assert row_counter.touched_rows == []
+
+    for column_index in range(10):
+        row_counter.occupy(grid, 9, column_index)
+    assert row_counter.pop_filled_rows(10) == [9]
+
+
+def test_solver_pools_are_bounded_per_thread():
+    for columns in range(4, 4 + 3 * SOLVER_POOLS_PER_THREAD):
+        assert solve("Q0", columns=columns) == 2
+
+    assert len(_thread_local.solver_pools) == SOLVER_POOLS_PER_THREAD
+    # the most recently used dimensions are kept
+    assert (10, 3 + 3 * SOLVER_POOLS_PER_THREAD) in _thread_local.solver_pools
+
+
+def test_solve_is_thread_safe():
+    sequences = [
+        "Q0,Q2,Q4,Q6,Q8,Q1",
+        "Q0,Q2,Q4,Q6,Q8,I0,I4,Q8,I0,I4",
+        "L0,J3,L5,J8,T1,T6,J2,L6,T0,T7",
+        "S0,S2,S4,S5,Q8,Q8,Q8,Q8,T1,Q1,I0,Q4",
+        "Q0,I2,I6,I0,I6,I6,Q2,Q4",
+        ",".join(["Q0"] * 5),
+    ]
+    expected_heights = {
+        sequence: TetrisSolver().solve(sequence) for sequence in sequences
+    }
+    workload = random.Random(0).choices(sequences, k=5000)
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        heights = list(executor.map(solve, workload))
+
+    assert heights == [expected_heights[sequence] for sequence in workload]
+
+
+def test_solve_resets_after_errors():
+    with pytest.raises(IndexError):
+        solve("Z1")
+
+    assert solve("Q0") == 2
+    assert solve("Q0", 2000, 2000) == 2
+
+
+def test_top_out_detection():
+    full_column = ",".join(["I0"] * 10)
+    assert TetrisSolver(detect_top_out=True).solve(full_column) == 10
+
+    # without detection the engine stacks the polyominoe onto the full column
+    assert TetrisSolver().solve(full_column + ",I0") == 10
+    with pytest.raises(TopOutError):
+        TetrisSolver(detect_top_out=True).solve(full_column + ",I0")
+    with pytest.raises(TopOutError):
+        TetrisSolver(detect_top_out=True).solve(full_column + ",Q2")
+
+
+def test_row_counts_match_grid():
+    tetris_solver = TetrisSolver()
+    sequences = [
+        "Q0,Q2,I4,T6",
+        "L0,J3,L5,J8,T1,T6,J2,L6,T0,T7",
+        "S0,S2,S4,S5,Q8,Q8,Q8,Q8,T1,Q1,I0,Q4",
+        "Q0,I2,I6,I0,I6,I6,Q2,Q4",
+    ]
+
+    for sequence in sequences:
+        tetris_solver.solve(sequence)
+        row_counts = tetris_solver.grid.sum(axis=1).tolist()
+        assert tetris_solver.row_counter.counts == row_counts
+        tetris_solver.reset()
+
+
+def test_find_periodic_prefix():
+    assert find_periodic_prefix(parse_sequence("Q0,Q2,Q4,Q0,Q2,Q4,Q0")) == (3, 7)
+    assert find_periodic_prefix(parse_sequence("Q0,Q0")) == (1, 2)
+    assert find_periodic_prefix(parse_sequence("Q0")) is None
+    assert find_periodic_prefix(parse_sequence("Q0,Q2,Q0,Q2,Q0,I4")) == (2, 5)
+    assert find_periodic_prefix(parse_sequence("Q0,Q2,Q4,Q0,Q2,Q4")) == (3, 6)
+    assert find_periodic_prefix(parse_sequence("Q0,Q2,Q4,I0")) is None
+
+
+def test_solver_fast_forward_matches_full_simulation():
+    patterns = [
+        "Q0,Q2,Q4,Q6,Q8",
+        "Q0,Q2,Q4,Q6,Q8,I0,I4,Q8,I0,I4",
+        "L0,J3,L5,J8,T1,T6,S2,Z5,T0,T7",
+        "I0,I4,Q8,I0,I4",
+    ]
+
+    for pattern in patterns:
+        for repetitions, tail in itertools.product([2, 7, 50], ["", ",Q0", ",I6,Q0"]):
+            sequence = ",".join([pattern] * repetitions) + tail
+            fast_solver = TetrisSolver()
+            full_solver = TetrisSolver(fast_forward=False)
+
+            assert fast_solver.solve(sequence) == full_solver.solve(sequence)
+            assert np.array_equal(fast_solver.grid, full_solver.grid)
+
+
+@pytest.mark.parametrize(
+    "pattern", ["L0,J3,L5,J8,T1,T6,S2,Z5,T0,T7", "I0,I4,Q8,I0,I4"]
+)
+def test_fast_forward_skips_repetitions_before_a_tail(pattern: str, monkeypatch):
+    placements = 0
+    place = TetrisSolver._TetrisSolver__place
+
+    def counting_place(self, polyominoe_type, column_index):
+        nonlocal placements
+        placements += 1
+        place(self, polyominoe_type, column_index)
+
+    monkeypatch.setattr(TetrisSolver, "_TetrisSolver__place", counting_place)
+    sequence = ",".join([pattern] * 2000) + ",Q0"
+    height = TetrisSolver().solve(sequence)
+
+    assert placements < 200
+    monkeypatch.undo()
+    assert height == TetrisSolver(fast_forward=False).solve(sequence)
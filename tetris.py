@@ -1,5 +1,10 @@
-from tetris_solver import TetrisSolver
+from persistent_cache import PersistentCache
+from sequences import parse_sequence, sequence_key
 import argparse
+import sys
+
+ROWS = 10
+COLUMNS = 10
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Tetris Solver")
@@ -12,8 +17,87 @@ if __name__ == "__main__":
         action="store_true", 
         help="If verbose is provided,the final grid configuration will be printed to the console."
     )
+    parser.add_argument(
+        "--frames",
+        action="store_true",
+        help="If frames is provided, the rows of the grid which change after every placement will be printed to the console."
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        help="If provided, memory is profiled while solving and the run fails if more than this many bytes are traced."
+    )
+    parser.add_argument(
+        "--memory-sample-every",
+        type=int,
+        default=1000,
+        help="The total of moves between memory samples when profiling. Defaults to 1000."
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        help="If provided, the solve stops after this many seconds and the moves placed so far are reported to stderr."
+    )
+    parser.add_argument(
+        "--max-moves",
+        type=int,
+        help="If provided, the solve stops after placing this many moves and the moves placed so far are reported to stderr."
+    )
+    parser.add_argument(
+        "--cache",
+        help="Path of a sqlite file used to cache the heights of sequences across runs. It is ignored when printing grids, profiling or solving with a budget."
+    )
     args = parser.parse_args()
     input = args.input_sequence
-    tetris_solver = TetrisSolver(verbose=args.verbose)
-    sequence_height = tetris_solver.solve(input)
+
+    cache = None
+    cache_key = None
+    prints_details = args.verbose or args.frames or args.memory_budget is not None
+    # a cached height is the height of the whole sequence, which a budget may not reach
+    has_budget = args.timeout is not None or args.max_moves is not None
+    if args.cache and not prints_details and not has_budget:
+        cache = PersistentCache(args.cache)
+        cache_key = sequence_key(parse_sequence(input), ROWS, COLUMNS)
+        cached_height = cache.get(cache_key)
+        if cached_height is not None:
+            cache.close()
+            print(cached_height)
+            sys.exit(0)
+
+    # imported after the cache lookup, so cache hits do not pay for importing numpy
+    from budget import SolveBudget, SolveTimeout
+    from profiling import MemoryProfiler
+    from tetris_solver import TetrisSolver
+
+    memory_profiler = None
+    if args.memory_budget is not None:
+        memory_profiler = MemoryProfiler(args.memory_sample_every, args.memory_budget)
+        memory_profiler.start()
+
+    tetris_solver = TetrisSolver(
+        ROWS,
+        COLUMNS,
+        verbose=args.verbose,
+        frames=args.frames,
+        memory_profiler=memory_profiler,
+    )
+    budget = None
+    if args.timeout is not None or args.max_moves is not None:
+        budget = SolveBudget(max_moves=args.max_moves, max_seconds=args.timeout)
+    try:
+        sequence_height = tetris_solver.solve(input, budget)
+    except SolveTimeout as timeout:
+        print(timeout, file=sys.stderr)
+        sys.exit(1)
+
+    if memory_profiler:
+        memory_profiler.stop()
+        for subsystem, report in memory_profiler.report().items():
+            print(
+                f"{subsystem}: peak {report.peak} bytes, steady state {report.steady_state} bytes",
+                file=sys.stderr,
+            )
+    if cache is not None:
+        cache.set(cache_key, sequence_height)
+        cache.close()
     print(sequence_height)
@@ -1,63 +1,147 @@
+import asyncio
+import contextlib
 import numpy as np
 import sys
 from numpy import ndarray
-from typing import List
-import re
-from models import AbstractPolyominoe
+from typing import Iterable, List, Sequence
+import threading
+from budget import SolveBudget, SolveProgress, SolveTimeout
+from models import AbstractPolyominoe, RowCounter, WrappedPolyominoeError
 from factory import PolyominoeFactory
+from profiling import MemoryProfiler
+from rendering import BoardRenderer, FrameRecorder
+from sequences import parse_sequence
+
+# The engine raises these for placements it cannot compute, for example a Z polyominoe on an empty
+# grid. They are engine errors, not a sign that the grid topped out. See `TopOutError`.
+ENGINE_ERRORS = (IndexError, WrappedPolyominoeError)
+
+# Idle solvers of each thread, keyed by the grid dimensions. Only the owning thread accesses them.
+_thread_local = threading.local()
+
+# The total of grid dimensions each thread keeps idle solvers for. The least recently used ones are dropped.
+SOLVER_POOLS_PER_THREAD = 4
+
+
+def _prefix_lengths(moves: List[tuple[str, int]]) -> List[int]:
+    """
+    The prefix function of the Knuth-Morris-Pratt algorithm: for every index, the length of the
+    longest proper prefix of `moves[: index + 1]` which is also its suffix.
+    """
+    prefix_lengths: List[int] = [0] * len(moves)
+    for index in range(1, len(moves)):
+        length = prefix_lengths[index - 1]
+        while length and moves[index] != moves[length]:
+            length = prefix_lengths[length - 1]
+        if moves[index] == moves[length]:
+            length += 1
+        prefix_lengths[index] = length
+    return prefix_lengths
+
+
+def find_periodic_prefix(moves: List[tuple[str, int]]) -> tuple[int, int] | None:
+    """
+    Finds the longest prefix of the moves which repeats a pattern at least twice, so sequences with
+    a periodic run followed by a different tail can also be fast-forwarded.
+
+    Returns
+    -------
+    A tuple with the length of the pattern and the length of the prefix, or `None` if no prefix
+    repeats a pattern
+    """
+    prefix_lengths = _prefix_lengths(moves)
+    for length in range(len(moves), 1, -1):
+        period = length - prefix_lengths[length - 1]
+        if 2 * period <= length:
+            return period, length
+    return None
+
+
+class TopOutError(Exception):
+    """
+    Raised, when top out detection is enabled, once a polyominoe does not fit below the top of the grid:
+    either one of its columns is already occupied up to the top row, or it would be placed above it.
+    """
+
+    def __init__(self, polyominoe_type: str, column_index: int):
+        self.polyominoe_type = polyominoe_type
+        self.column_index = column_index
+        super().__init__(
+            f"{polyominoe_type}{column_index} does not fit below the top of the grid"
+        )
 
 
 class TetrisSolver:
-    def __init__(self, rows: int = 10, columns: int = 10, verbose=False):
+    def __init__(
+        self,
+        rows: int = 10,
+        columns: int = 10,
+        verbose=False,
+        frames=False,
+        fast_forward=True,
+        memory_profiler: MemoryProfiler | None = None,
+        grid: ndarray[int] | None = None,
+        detect_top_out=False,
+        record_changes=False,
+    ):
         self.grid: ndarray[int] = None
         self.rows = rows
         self.columns = columns
         self.verbose:bool = verbose
+        self.board_renderer = BoardRenderer(columns) if verbose else None
+        # records the changed rows of the grid after every placement
+        self.frame_recorder = FrameRecorder(rows, columns) if frames else None
+        # skips whole repetitions of periodic sequences once the solver state recurs
+        self.fast_forward: bool = fast_forward
+        # samples the memory of the solver every N moves
+        self.memory_profiler = memory_profiler
+        # raises `TopOutError` instead of stacking polyominoes onto full columns, which the engine
+        # otherwise does without complaining
+        self.detect_top_out: bool = detect_top_out
+        # the `(row, column)` of every cell changed by the last placement, including line clears and
+        # shifted polyominoes. Only recorded when `record_changes` is enabled
+        self.record_changes: bool = record_changes
+        self.changed_cells: List[tuple[int, int]] = []
         self.polyominoes: List[AbstractPolyominoe] = []
         self.polyominoe_factory = PolyominoeFactory()
         self.is_empty: bool = True
-        self.__init_state()
+        # total of occupied cells in every row of the grid
+        self.row_counter = RowCounter(rows)
+        self.__init_state(grid)
 
-    def __add_polyminoe_to_grid(self, polyominoe: AbstractPolyominoe, cell: dict):
+    def __add_polyminoe_to_grid(
+        self, polyominoe: AbstractPolyominoe, row_index: int, column_index: int
+    ):
         """
         Ads the polyominoe to the tetris grid
 
         Args
         ----
         - `polyominoe:InterfacePolyominoe` - The polyominoe to place
-        - `cell:dict` - A dictionary containing the row and column index of the initial cell the polyminoe
-        will be added to
+        - `row_index:int` - The row index of the initial cell the polyminoe will be added to
+        - `column_index:int` - The column index of the initial cell the polyminoe will be added to
         """
 
-        polyominoe.add(self.grid, cell)
+        polyominoe.add(self.grid, row_index, column_index, self.row_counter)
         self.polyominoes.append(polyominoe)
 
-    def __extract_polyominoe_data(self, input: str) -> dict[int, str]:
-        """
-        Extracts the the polyominoe data from an entry in the input line.
-        Note: The method assumes that all inputs will always have a single alphabeitcal letter
-        and a single integer.
-
-        Returns
-        -------
-        A dict with the following keys:
-            - `column_index:int`: The index of the column of where the polyominoe should be placed.
-            - `polyominoe:str`: The letter of the polyominoe
-        """
-        match = re.match(r"([A-Za-z])(\d+)", input)
-        column_index = int(match.group(2))
-        if column_index == self.columns:
-            column_index = self.columns - 1
-        return {"column_index": int(match.group(2)), "polyominoe": match.group(1)}
-
-    def __init_state(self):
+    def __init_state(self, grid: ndarray[int] | None):
         """
         Initializes the initial state of the grid to zero.\n
         - 0 = empty
         - 1 = occupied
+
+        Args
+        ----
+        - `grid:ndarray[int]` - If provided, an array with shape `(rows, columns)` which is used as the grid
+        instead of allocating one, for example a view into shared memory. It is updated in place.
         """
 
-        self.grid: ndarray[int] = np.zeros((self.rows, self.columns), dtype=int)
+        if grid is None:
+            self.grid: ndarray[int] = np.zeros((self.rows, self.columns), dtype=int)
+        else:
+            grid.fill(0)
+            self.grid = grid
 
     def __calculate_placement(self, polyominoe_type: str, column_index: int):
         """
@@ -72,18 +156,25 @@ class TetrisSolver:
 
         polyominoe: AbstractPolyominoe = self.polyominoe_factory.create(polyominoe_type)
 
+        if self.detect_top_out and self.grid[
+            0, column_index : column_index + polyominoe.width()
+        ].any():
+            self.polyominoe_factory.release(polyominoe)
+            raise TopOutError(polyominoe_type, column_index)
+
         bottom_most_cell_index = self.rows - 1
 
         if self.is_empty:
-            cell = {"row": bottom_most_cell_index, "column": column_index}
-            self.__add_polyminoe_to_grid(polyominoe, cell)
+            self.__add_polyminoe_to_grid(
+                polyominoe, bottom_most_cell_index, column_index
+            )
             self.is_empty = False
             return
 
-        # only contains empty cells (0)
-        cells_to_traverse: List[int] = self.grid[
-            self.grid[:, column_index] == 0, column_index
-        ]
+        # total of empty cells (0) in the column
+        empty_cell_count: int = self.rows - np.count_nonzero(
+            self.grid[:, column_index]
+        )
 
         found_collision: bool = False
         total_entries: int = self.grid.shape[1]
@@ -91,7 +182,7 @@ class TetrisSolver:
         # NOTE: This literally recreates 'dropping' polyominoes from the top
         # but I believe that for the purposes of the excersice, its not strictly neccesary.
         # There can be a more efficient way which is to start from the bottom of the grid
-        for row_index, cell in enumerate(cells_to_traverse):
+        for row_index in range(empty_cell_count):
             if row_index == total_entries - 1:
                 continue
 
@@ -100,15 +191,15 @@ class TetrisSolver:
             )
             if has_collision:
                 # Adds the polyominoe to the grid before any collision with another existing polyominoe
-                cell = {"row": row_index, "column": column_index}
-                self.__add_polyminoe_to_grid(polyominoe, cell)
+                self.__add_polyminoe_to_grid(polyominoe, row_index, column_index)
                 found_collision = True
                 break
 
         if found_collision is False:
             # Adds the polyominoe to the bottom of the grid.
-            cell = {"row": bottom_most_cell_index, "column": column_index}
-            self.__add_polyminoe_to_grid(polyominoe, cell)
+            self.__add_polyminoe_to_grid(
+                polyominoe, bottom_most_cell_index, column_index
+            )
 
     def __place(self, polyominoe_type: str, column_index: int):
         """
@@ -120,49 +211,197 @@ class TetrisSolver:
         """
 
         self.__calculate_placement(polyominoe_type, column_index)
-
-        result: dict[int, bool] = self.__destroy_filled_rows()
-        if result["destroyed"]:
+        if self.detect_top_out:
+            # cells above the top row wrap around to the bottom of the grid
+            for cell in self.polyominoes[-1].body:
+                if cell.row_index < 0:
+                    raise TopOutError(polyominoe_type, column_index)
+
+        if self.record_changes:
+            self.changed_cells.clear()
+            self.__record_cells(self.polyominoes[-1])
+
+        destroyed_rows: Sequence[int] = self.__destroy_filled_rows()
+        if destroyed_rows:
+            if self.record_changes:
+                for row_index in destroyed_rows:
+                    self.changed_cells.extend(
+                        (row_index, col_index) for col_index in range(self.columns)
+                    )
             for polyominoe in self.polyominoes:
-                polyominoe.shift_down(self.grid)
-       
+                if self.record_changes:
+                    # the cells before and after the shift
+                    self.__record_cells(polyominoe)
+                    polyominoe.shift_down(self.grid, self.row_counter)
+                    self.__record_cells(polyominoe)
+                else:
+                    polyominoe.shift_down(self.grid, self.row_counter)
+
+    def __record_cells(self, polyominoe: AbstractPolyominoe):
+        self.changed_cells.extend(
+            (cell.row_index, cell.col_index) for cell in polyominoe.body
+        )
+
+    def __place_observed(self, moves: Iterable[tuple[str, int]]):
+        """
+        Places every move one by one, recording frames and sampling memory when enabled.
+        """
+        try:
+            for polyominoe, column_index in moves:
+                self.__place(polyominoe, column_index)
+                if self.frame_recorder:
+                    self.frame_recorder.record(self.grid)
+                if self.memory_profiler:
+                    self.memory_profiler.record_move(self)
+
+            if self.memory_profiler:
+                self.memory_profiler.record_end(self)
+        finally:
+            # the frames up to a failed placement are the ones needed to debug it
+            if self.frame_recorder:
+                self.frame_recorder.flush()
+
+    def __snapshot_state(self) -> tuple:
+        """
+        Copies everything which determines the outcome of the following placements: the grid,
+        whether it is empty and the type and cells of every polyominoe, in order.
+        """
+        return (
+            list(self.row_counter.counts),
+            self.grid.copy(),
+            self.is_empty,
+            self.__polyominoes_state(),
+        )
+
+    def __polyominoes_state(self) -> List[tuple]:
+        return [
+            (
+                type(polyominoe),
+                [(cell.row_index, cell.col_index) for cell in polyominoe.body],
+            )
+            for polyominoe in self.polyominoes
+        ]
+
+    def __state_equals(self, state: tuple) -> bool:
+        """
+        Compares the current state against a `__snapshot_state`, cheapest comparisons first
+        """
+        row_counts, grid, is_empty, polyominoes_state = state
+        return (
+            self.row_counter.counts == row_counts
+            and self.is_empty == is_empty
+            and np.array_equal(self.grid, grid)
+            and self.__polyominoes_state() == polyominoes_state
+        )
+
+    def __place_periodic(
+        self, moves: List[tuple[str, int]], budget: SolveBudget | None = None
+    ):
+        """
+        Places a list of moves, fast-forwarding through the repetitions of the pattern of its longest
+        periodic prefix. The moves after that prefix are placed one by one.
 
-    def __destroy_filled_rows(self) -> dict[int, bool]:
+        At the start of every repetition the solver state is compared against a saved state, which is
+        replaced at exponentially spaced repetitions (Brent's cycle detection). Once the state
+        recurs, the following moves repeat the same states, so whole cycles are skipped
+        and only the remainder is simulated.
+
+        The budget is checked before every placement, counting skipped moves as placed. Cycles are
+        never skipped past its `max_moves`.
+        """
+        move_count = len(moves)
+        if budget is not None:
+            budget.start()
+            if budget.max_moves is not None:
+                move_count = min(move_count, budget.max_moves)
+
+        periodic_prefix: tuple[int, int] | None = find_periodic_prefix(moves)
+        move_index = 0
+
+        if periodic_prefix is not None:
+            period, run_end = periodic_prefix
+            run_end = min(run_end, move_count)
+            saved_state: tuple | None = None
+            saved_index = 0
+            checkpoint_distance = 1
+            repetitions_since_checkpoint = 1
+
+            while move_index < run_end:
+                if move_index % period == 0:
+                    if saved_state is not None and self.__state_equals(saved_state):
+                        cycle_length = move_index - saved_index
+                        skipped_cycles = (run_end - move_index) // cycle_length
+                        move_index += skipped_cycles * cycle_length
+                        break
+
+                    if repetitions_since_checkpoint == checkpoint_distance:
+                        saved_state = self.__snapshot_state()
+                        saved_index = move_index
+                        checkpoint_distance *= 2
+                        repetitions_since_checkpoint = 0
+                    repetitions_since_checkpoint += 1
+
+                if budget is not None and not budget.allows(move_index):
+                    return
+                polyominoe, column_index = moves[move_index]
+                self.__place(polyominoe, column_index)
+                move_index += 1
+
+        for index in range(move_index, move_count):
+            if budget is not None and not budget.allows(index):
+                return
+            polyominoe, column_index = moves[index]
+            self.__place(polyominoe, column_index)
+
+        if budget is not None:
+            # sets `exhausted_reason` if moves are left beyond `max_moves`
+            if move_count < len(moves):
+                budget.allows(move_count)
+            else:
+                budget.moves = move_count
+
+    def __destroy_filled_rows(self) -> Sequence[int]:
         """
-        Find the first row in the array that contains only '1' entries and replace all '1's with '0's in that row.
+        Find the rows in the array that contain only '1' entries and replace all '1's with '0's in those rows.
+        Only the rows which gained cells since the last call are checked, using the occupied cell
+        counts of the `RowCounter`. Polyominoes which get completely removed are released back
+        to the `PolyominoeFactory`.
 
         Returns
         -------
-        A dictionary containing the following keys:
-        - `filled_rows_indexes:List[int]` - A list containing all the indices of the rows which are filled
-        - `destroyed:bool` - A boolean value which is `True` is there where any filled rows that where destroyed.
-            `destroyed` would be false`False` if no filled rows where found
-
+        The sorted indices of the filled rows which were destroyed. Empty if no filled rows where found
         """
-        # creates a boolean mask for all the rows. Only the rows which are filled
-        # will have a value of True
-        mask: List[bool] = np.all(self.grid == 1, axis=1)
-        if np.any(mask):
-            # Gets the indices of all rows in the grid that contain only '1's.
-            filled_rows_indexes: List[int] = np.where(np.all(self.grid == 1, axis=1))[0]
+        filled_rows_indexes: Sequence[int] = self.row_counter.pop_filled_rows(
+            self.columns
+        )
+        if not filled_rows_indexes:
+            return filled_rows_indexes
 
-            for filled_row_index in filled_rows_indexes:
-                for polyominoe in self.polyominoes:
-                    polyominoe.remove(filled_row_index)
+        for filled_row_index in filled_rows_indexes:
+            for polyominoe in self.polyominoes:
+                polyominoe.remove(filled_row_index)
 
-            # Only keep polyominoes which did not get completely removed.
-            self.polyominoes = [
-                polyominoe
-                for polyominoe in self.polyominoes
-                if len(polyominoe.body) != 0
-            ]
+        # Only keep polyominoes which did not get completely removed.
+        self.__release_removed_polyominoes()
 
-            for filled_row_index in filled_rows_indexes:
-                self.grid[filled_row_index, :] = 0
+        for filled_row_index in filled_rows_indexes:
+            self.grid[filled_row_index, :] = 0
+            self.row_counter.clear_row(filled_row_index)
 
-            return {"filled_rows_indexes": filled_rows_indexes, "destroyed": True}
+        return filled_rows_indexes
 
-        return {"destroyed": False}
+    def __release_removed_polyominoes(self):
+        """
+        Compacts `polyominoes` in place, releasing the ones which got completely removed from the grid.
+        """
+        kept_count = 0
+        for polyominoe in self.polyominoes:
+            if polyominoe.body:
+                self.polyominoes[kept_count] = polyominoe
+                kept_count += 1
+            else:
+                self.polyominoe_factory.release(polyominoe)
+        del self.polyominoes[kept_count:]
 
     def __compute_sequence_height(self) -> int:
         """
@@ -185,37 +424,153 @@ class TetrisSolver:
         return height
 
     def reset(self):
-        self.polyominoes = []
-        self.__init_state()
+        for polyominoe in self.polyominoes:
+            self.polyominoe_factory.release(polyominoe)
+        self.polyominoes.clear()
+        self.grid.fill(0)
+        self.row_counter.reset()
         self.is_empty = True
+        if self.frame_recorder:
+            self.frame_recorder.reset()
 
-    def solve(self, input: str) -> int:
+    def solve(self, input: str, budget: SolveBudget | None = None) -> int:
         """
         Runs the tetris engine for the given input string.
 
         Args
         ----
-        `input:str` - The input containing the sequence of polyominoes to process. For example:\n
+        - `input:str` - The input containing the sequence of polyominoes to process. For example:\n
             - 'Q0,Q1'
             - 'Q0,Q2,Q4,Q6,Q8'
+        - `budget:SolveBudget` - If provided, limits the moves and seconds spent solving
 
         Returns
         --------
         An integer which specifies the height of the top most cell which is occupied by a polyominoe,
         after the sequence has been solved.
 
+        Raises
+        ------
+        `SolveTimeout` with the partial result if the budget is exhausted or cancelled
         """
-        lines: List[str] = input.split(",")
+        return self.solve_moves(parse_sequence(input), budget)
 
-        for line in lines:
-            polyominoe_data: dict[int, str] = self.__extract_polyominoe_data(line)
-            polyominoe: str = polyominoe_data["polyominoe"]
-            column_index: int = polyominoe_data["column_index"]
+    def solve_moves(
+        self, moves: Iterable[tuple[str, int]], budget: SolveBudget | None = None
+    ) -> int:
+        """
+        Runs the tetris engine for an already parsed sequence of polyominoes.
+
+        Args
+        ----
+        - `moves:Iterable[tuple[str, int]]` - The `(polyominoe, column_index)` pairs to process. For example:\n
+            - `[("Q", 0), ("Q", 1)]`
+        - `budget:SolveBudget` - If provided, limits the moves and seconds spent solving
+
+        Returns
+        --------
+        An integer which specifies the height of the top most cell which is occupied by a polyominoe,
+        after the sequence has been solved.
+
+        Raises
+        ------
+        `SolveTimeout` with the partial result if the budget is exhausted or cancelled
+        """
+        if self.frame_recorder or self.memory_profiler:
+            self.__place_observed(moves if budget is None else budget.track(moves))
+        elif self.fast_forward and isinstance(moves, list):
+            self.__place_periodic(moves, budget)
+        else:
+            if budget is not None:
+                moves = budget.track(moves)
+            for polyominoe, column_index in moves:
+                self.__place(polyominoe, column_index)
+
+        if budget is not None and budget.exhausted_reason is not None:
+            raise SolveTimeout(
+                SolveProgress(
+                    budget.moves,
+                    int(self.__compute_sequence_height()),
+                    budget.exhausted_reason,
+                )
+            )
 
-            self.__place(polyominoe, column_index)
-        
         if self.verbose:
-            np.savetxt(sys.stdout, self.grid, fmt='%d', delimiter=' ')
-            print('\n')
+            sys.stdout.write(self.board_renderer.render(self.grid) + "\n\n")
         sequence_height = self.__compute_sequence_height()
         return sequence_height
+
+
+def solve(
+    sequence: str,
+    rows: int = 10,
+    columns: int = 10,
+    budget: SolveBudget | None = None,
+) -> int:
+    """
+    Stateless, thread-safe version of `TetrisSolver.solve`.
+    Solvers are pooled per thread and reset after every call, so the function can be called
+    concurrently from any number of threads, and reentrantly from within the same thread.
+    Each thread only pools solvers for its `SOLVER_POOLS_PER_THREAD` most recently used grid dimensions.
+
+    Args
+    ----
+    - `sequence:str` - The input containing the sequence of polyominoes to process. For example 'Q0,Q1'
+    - `rows:int`, `columns:int` - The grid dimensions
+    - `budget:SolveBudget` - If provided, limits the moves and seconds spent solving
+
+    Returns
+    --------
+    An integer which specifies the height of the top most cell which is occupied by a polyominoe,
+    after the sequence has been solved.
+    """
+    solver_pools: dict[tuple[int, int], List[TetrisSolver]] | None = getattr(
+        _thread_local, "solver_pools", None
+    )
+    if solver_pools is None:
+        solver_pools = _thread_local.solver_pools = {}
+    # reinserted on every call, so the dictionary is ordered from the least to the most recently used
+    solver_pool: List[TetrisSolver] | None = solver_pools.pop((rows, columns), None)
+    if solver_pool is None:
+        solver_pool = []
+    solver_pools[(rows, columns)] = solver_pool
+    if len(solver_pools) > SOLVER_POOLS_PER_THREAD:
+        del solver_pools[next(iter(solver_pools))]
+
+    # solvers are taken out of the pool while in use
+    tetris_solver = solver_pool.pop() if solver_pool else TetrisSolver(rows, columns)
+    try:
+        return int(tetris_solver.solve(sequence, budget))
+    finally:
+        tetris_solver.reset()
+        solver_pool.append(tetris_solver)
+
+
+async def solve_async(
+    sequence: str,
+    rows: int = 10,
+    columns: int = 10,
+    budget: SolveBudget | None = None,
+) -> int:
+    """
+    Runs the functional `solve` in the default executor of the running event loop.
+    Cancelling the awaiting task cancels the budget, so the worker thread stops before its next
+    placement instead of running the sequence to the end.
+
+    Raises
+    ------
+    `SolveTimeout` if the budget is exhausted
+    """
+    if budget is None:
+        budget = SolveBudget()
+    future = asyncio.get_running_loop().run_in_executor(
+        None, solve, sequence, rows, columns, budget
+    )
+    try:
+        # shielded so a cancellation does not abandon the thread while it is still solving
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        budget.cancel()
+        with contextlib.suppress(SolveTimeout):
+            await future
+        raise